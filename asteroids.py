@@ -0,0 +1,202 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+from ephemeris import wrap_angle
+from meshes import get_sphere
+from shaders import create_program, uniform
+from gl_state import state
+
+
+# ======================
+# Populações de corpos menores
+# ======================
+def add_asteroid_belt(eph, count, a_range=(14.0, 19.0), seed=1):
+    """Acrescenta `count` asteroides ao Ephemeris entre Marte e Júpiter. Devolve os índices."""
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(*a_range, count)
+    return eph.add([f"asteroid{i}" for i in range(count)], a,
+                   e=rng.uniform(0.0, 0.05, count),
+                   inc=rng.normal(0.0, 4.0, count),
+                   node=rng.uniform(0.0, 360.0, count),
+                   peri=rng.uniform(0.0, 360.0, count),
+                   mean_anomaly=rng.uniform(0.0, 360.0, count),
+                   mean_motion=30.0 * (13.0 / a) ** 1.5)  # terceira lei de Kepler a partir de Marte
+
+
+def add_minor_moons(eph, parent, count, a_range, seed=2):
+    """Acrescenta `count` luas pequenas em torno de `parent`. Devolve os índices."""
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(*a_range, count)
+    return eph.add([f"{parent}_moon{i}" for i in range(count)], a,
+                   e=rng.uniform(0.0, 0.05, count),
+                   inc=rng.normal(0.0, 10.0, count),
+                   node=rng.uniform(0.0, 360.0, count),
+                   peri=rng.uniform(0.0, 360.0, count),
+                   mean_anomaly=rng.uniform(0.0, 360.0, count),
+                   mean_motion=120.0 * (a_range[0] / a) ** 1.5,
+                   parent=parent)
+
+
+def random_appearance(count, size_range=(0.015, 0.06), seed=3):
+    """Escalas e cores cinza-amarronzadas aleatórias para `count` corpos."""
+    rng = np.random.default_rng(seed)
+    scales = rng.uniform(*size_range, count)
+    tint = np.array([0.55, 0.50, 0.45])
+    colors = np.clip(tint * rng.uniform(0.6, 1.3, (count, 1)) + rng.normal(0.0, 0.04, (count, 3)), 0.0, 1.0)
+    return scales.astype(np.float32), colors.astype(np.float32)
+
+
+# ======================
+# Desenho instanciado
+# ======================
+MAX_ORIGINS = 8        # pais distintos (mais a origem) que os corpos menores podem orbitar
+KEPLER_ITERATIONS = 4  # passos de Newton no shader; sobra para e < 0.3
+EPOCH_SPAN = 60.0      # segundos de simulação até reposicionar a época (precisão de float no shader)
+
+INSTANCE_VERT_SRC = f"""
+#version 120
+attribute vec3 aPosition;
+attribute vec3 aNormal;
+attribute vec4 aOrbitP;     // xyz = P·a (rumo ao periastro), w = excentricidade
+attribute vec4 aOrbitQ;     // xyz = Q·b, w = escala
+attribute vec3 aPhase;      // x = anomalia média na época, y = movimento médio (rad/s), z = índice do pai
+attribute vec3 aColor;
+uniform float uTime;        // segundos desde a época
+uniform vec3 uOrigins[{MAX_ORIGINS}];
+uniform vec3 uLightPosV;
+varying vec3 vColor;
+void main() {{
+    // Kepler por instância: E - e·sin E = M, Newton a partir de M + e·sin M
+    float e = aOrbitP.w;
+    float M = mod(aPhase.x + aPhase.y * uTime + 3.14159265, 6.28318531) - 3.14159265;
+    float E = M + e * sin(M);
+    for (int i = 0; i < {KEPLER_ITERATIONS}; i++)
+        E -= (E - e * sin(E) - M) / (1.0 - e * cos(E));
+    vec3 center = uOrigins[int(aPhase.z)] + aOrbitP.xyz * (cos(E) - e) + aOrbitQ.xyz * sin(E);
+
+    vec4 posV = gl_ModelViewMatrix * vec4(center + aPosition * aOrbitQ.w, 1.0);
+    vec3 N = normalize(gl_NormalMatrix * aNormal);
+    vec3 L = normalize(uLightPosV - posV.xyz);
+    vColor = aColor * (0.12 + 0.88 * max(dot(N, L), 0.0));
+    gl_Position = gl_ProjectionMatrix * posV;
+}}
+"""
+
+INSTANCE_FRAG_SRC = """
+#version 120
+varying vec3 vColor;
+void main() {
+    gl_FragColor = vec4(vColor, 1.0);
+}
+"""
+
+ATTRIBUTES = {"aPosition": 0, "aNormal": 1, "aOrbitP": 2, "aColor": 3, "aOrbitQ": 4, "aPhase": 5}
+_INSTANCE_ATTRIBUTES = ("aOrbitP", "aOrbitQ", "aPhase", "aColor")
+
+
+class InstancedBodies:
+    """Milhares de corpos pequenos desenhados com uma malha compartilhada e um draw instanciado.
+
+    As órbitas são avaliadas no vertex shader: cada instância leva os seus
+    elementos keplerianos num buffer estático (semi-eixos no plano orbital,
+    excentricidade, escala e cor), e a CPU só passa por frame o tempo e a
+    posição dos pais (`origins`, corpos que a CPU já calcula). A anomalia
+    média fica num buffer à parte, reenviado quando a época anda
+    EPOCH_SPAN segundos, para o tempo no shader caber em um float.
+    """
+
+    def __init__(self, eph, bodies, scales, colors, slices=6, stacks=4):
+        self.bodies = np.asarray(bodies)
+        self.count = len(self.bodies)
+        self.scales = np.asarray(scales, dtype=np.float32)
+        self.mesh = get_sphere(slices, stacks)
+        self.program = create_program(INSTANCE_VERT_SRC, INSTANCE_FRAG_SRC, ATTRIBUTES)
+
+        # Pais dos corpos: slot 0 é a origem (Sol), os demais vêm de update()
+        parents = eph.parent[self.bodies]
+        self.origins = np.unique(parents[parents >= 0])
+        if len(self.origins) >= MAX_ORIGINS:
+            raise ValueError(f"{len(self.origins)} corpos pais; o shader aceita {MAX_ORIGINS - 1}")
+        if np.isin(self.origins, self.bodies).any():
+            raise ValueError("um corpo instanciado não pode ser pai de outro")
+        self.origin_positions = np.zeros((MAX_ORIGINS, 3), dtype=np.float32)
+
+        P, Q = eph.orbit_axes(self.bodies)
+        orbits = np.empty((self.count, 8), dtype=np.float32)
+        orbits[:, 0:3] = P
+        orbits[:, 3] = eph.e[self.bodies]
+        orbits[:, 4:7] = Q
+        orbits[:, 7] = self.scales
+        self._M0 = eph.M0[self.bodies]
+        self.phase = np.empty((self.count, 3), dtype=np.float32)
+        self.phase[:, 1] = self._n = eph.n[self.bodies]
+        self.phase[:, 2] = np.where(parents >= 0, np.searchsorted(self.origins, parents) + 1, 0)
+        self.epoch = None
+        self.time = 0.0
+
+        self.orbit_vbo, self.phase_vbo, self.color_vbo = glGenBuffers(3)
+        glBindBuffer(GL_ARRAY_BUFFER, self.orbit_vbo)
+        glBufferData(GL_ARRAY_BUFFER, orbits.nbytes, orbits, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.phase_vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.phase.nbytes, None, GL_DYNAMIC_DRAW)
+        colors = np.ascontiguousarray(colors, dtype=np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glBufferData(GL_ARRAY_BUFFER, colors.nbytes, colors, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def update(self, t, origins):
+        """Leva os corpos ao tempo t; `origins` são as posições no mundo de self.origins."""
+        if self.epoch is None or abs(t - self.epoch) > EPOCH_SPAN:
+            self.epoch = t
+            self.phase[:, 0] = wrap_angle(self._M0 + self._n * t)
+            glBindBuffer(GL_ARRAY_BUFFER, self.phase_vbo)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, self.phase.nbytes, self.phase)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.time = t - self.epoch
+        self.origin_positions[1:len(self.origins) + 1] = origins
+
+    def draw(self, light_view):
+        state.use_program(self.program)
+        glUniform3f(uniform(self.program, "uLightPosV"), *light_view)
+        glUniform1f(uniform(self.program, "uTime"), self.time)
+        glUniform3fv(uniform(self.program, "uOrigins"), MAX_ORIGINS, self.origin_positions)
+
+        loc = ATTRIBUTES
+        glBindBuffer(GL_ARRAY_BUFFER, self.mesh.vbo)
+        glEnableVertexAttribArray(loc["aPosition"])
+        glEnableVertexAttribArray(loc["aNormal"])
+        glVertexAttribPointer(loc["aPosition"], 3, GL_FLOAT, GL_FALSE, self.mesh.STRIDE, ctypes.c_void_p(0))
+        glVertexAttribPointer(loc["aNormal"], 3, GL_FLOAT, GL_FALSE, self.mesh.STRIDE, ctypes.c_void_p(12))
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.orbit_vbo)
+        glEnableVertexAttribArray(loc["aOrbitP"])
+        glEnableVertexAttribArray(loc["aOrbitQ"])
+        glVertexAttribPointer(loc["aOrbitP"], 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(0))
+        glVertexAttribPointer(loc["aOrbitQ"], 4, GL_FLOAT, GL_FALSE, 32, ctypes.c_void_p(16))
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.phase_vbo)
+        glEnableVertexAttribArray(loc["aPhase"])
+        glVertexAttribPointer(loc["aPhase"], 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glEnableVertexAttribArray(loc["aColor"])
+        glVertexAttribPointer(loc["aColor"], 3, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+
+        for name in _INSTANCE_ATTRIBUTES:
+            glVertexAttribDivisor(loc[name], 1)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.mesh.ibo)
+        glDrawElementsInstanced(GL_TRIANGLES, self.mesh.count, self.mesh.index_type,
+                                ctypes.c_void_p(0), self.count)
+
+        for name in _INSTANCE_ATTRIBUTES:
+            glVertexAttribDivisor(loc[name], 0)
+        for location in loc.values():
+            glDisableVertexAttribArray(location)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(3, [self.orbit_vbo, self.phase_vbo, self.color_vbo])
+        glDeleteProgram(self.program)
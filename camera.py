@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+
+# ======================
+# Matrizes de câmera na CPU
+# ======================
+FOVY = 45.0
+NEAR = 0.1
+FAR = 500.0
+
+
+def camera_eye(angle_x, angle_y, distance):
+    """Posição da câmera orbital a partir dos ângulos (graus) e da distância."""
+    rad_x = math.radians(angle_x)
+    rad_y = math.radians(angle_y)
+    return np.array([
+        distance * math.cos(rad_x) * math.sin(rad_y),
+        distance * math.sin(rad_x),
+        distance * math.cos(rad_x) * math.cos(rad_y),
+    ])
+
+
+def look_at(eye, target, up):
+    """Equivalente ao gluLookAt (matriz 4x4 em convenção de vetor-coluna)."""
+    eye = np.asarray(eye, dtype=np.float64)
+    f = np.asarray(target, dtype=np.float64) - eye
+    f /= np.linalg.norm(f)
+    s = np.cross(f, up)
+    s /= np.linalg.norm(s)
+    u = np.cross(s, f)
+
+    m = np.identity(4)
+    m[0, :3] = s
+    m[1, :3] = u
+    m[2, :3] = -f
+    m[:3, 3] = -m[:3, :3] @ eye
+    return m
+
+
+def perspective(fovy, aspect, near, far):
+    """Equivalente ao gluPerspective (matriz 4x4 em convenção de vetor-coluna)."""
+    f = 1.0 / math.tan(math.radians(fovy) / 2.0)
+    m = np.zeros((4, 4))
+    m[0, 0] = f / aspect
+    m[1, 1] = f
+    m[2, 2] = (far + near) / (near - far)
+    m[2, 3] = 2.0 * far * near / (near - far)
+    m[3, 2] = -1.0
+    return m
+
+
+def scripted_camera(frame, frames):
+    """Trajetória fixa para benchmarks e exportação: uma volta completa
+    aproximando de 80 até 5 unidades e afastando de novo, subindo e descendo.
+
+    Devolve (angle_x, angle_y, distance) como as variáveis globais de main.py.
+    """
+    u = frame / max(frames - 1, 1)
+    angle_y = 180.0 + 360.0 * u
+    angle_x = 10.0 + 35.0 * math.sin(2.0 * math.pi * u)
+    distance = 5.0 + 75.0 * (0.5 + 0.5 * math.cos(2.0 * math.pi * u))
+    return angle_x, angle_y, distance
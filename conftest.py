@@ -0,0 +1 @@
+# Raiz do projeto no sys.path para os testes importarem os módulos da cena
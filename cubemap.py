@@ -0,0 +1,244 @@
+import argparse
+import ctypes
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from OpenGL.GL import *
+
+import texture_cache
+from gl_state import state
+from shaders import create_program, uniform
+
+
+# ======================
+# Conversão equiretangular -> cubemap (NumPy)
+# ======================
+# Ordem das faces = GL_TEXTURE_CUBE_MAP_POSITIVE_X + i
+FACE_NAMES = ["+x", "-x", "+y", "-y", "+z", "-z"]
+
+
+def face_directions(face, size):
+    """Direção (não normalizada) de cada texel da face, na convenção de cubemap do OpenGL.
+
+    Linha 0 é t = 0, como os dados enviados com glTexImage2D.
+    """
+    c = (np.arange(size, dtype=np.float32) + 0.5) / size * 2.0 - 1.0
+    b, a = np.meshgrid(c, c, indexing="ij")  # a cresce com a coluna (s), b com a linha (t)
+    one = np.ones_like(a)
+    x, y, z = {
+        0: (one, -b, -a),
+        1: (-one, -b, a),
+        2: (a, one, b),
+        3: (a, -one, -b),
+        4: (a, -b, one),
+        5: (-a, -b, -one),
+    }[face]
+    return np.stack([x, y, z], axis=-1)
+
+
+def sample_equirect(image, dirs):
+    """Amostra bilinear da imagem equiretangular nas direções `dirs` (..., 3).
+
+    Usa o mesmo mapeamento de build_uv_sphere (polos no eixo Z, s em torno do
+    polo), então o céu fica orientado como a antiga esfera invertida. `image`
+    está em ordem de linhas do GL (linha 0 = polo -Z).
+    """
+    h, w = image.shape[:2]
+    x, y, z = dirs[..., 0], dirs[..., 1], dirs[..., 2]
+    theta = np.mod(np.arctan2(-x, y), 2.0 * np.pi)
+    rho = np.arccos(np.clip(z / np.sqrt(x * x + y * y + z * z), -1.0, 1.0))
+
+    u = theta / (2.0 * np.pi) * w - 0.5
+    v = (1.0 - rho / np.pi) * h - 0.5
+    x0 = np.floor(u)
+    y0 = np.floor(v)
+    fx = (u - x0)[..., None]
+    fy = (v - y0)[..., None]
+    x0 = x0.astype(np.int64) % w
+    x1 = (x0 + 1) % w  # s dá a volta
+    y1 = np.clip(y0.astype(np.int64) + 1, 0, h - 1)
+    y0 = np.clip(y0.astype(np.int64), 0, h - 1)
+
+    top = image[y0, x0] * (1.0 - fx) + image[y0, x1] * fx
+    bottom = image[y1, x0] * (1.0 - fx) + image[y1, x1] * fx
+    return np.clip(top * (1.0 - fy) + bottom * fy + 0.5, 0, 255).astype(np.uint8)
+
+
+def equirect_to_cubemap(image, face_size):
+    """Seis faces (6, face_size, face_size, 3) uint8 a partir da imagem (h, w, 3)."""
+    faces = np.empty((6, face_size, face_size, image.shape[2]), dtype=np.uint8)
+    for face in range(6):  # uma face por vez limita a memória temporária
+        faces[face] = sample_equirect(image, face_directions(face, face_size))
+    return faces
+
+
+# ======================
+# Cache em disco
+# ======================
+def _cube_paths(path, face_size, cache_dir):
+    base = os.path.join(cache_dir, f"{texture_cache.cache_key(path, cache_dir)}_cube{face_size}")
+    return base + ".bin", base + ".json"
+
+
+def build_cubemap(path, face_size, cache_dir=texture_cache.CACHE_DIR):
+    """Converte a imagem e grava as faces no cache. O nível de mip de origem tem
+    ~4 texels por texel de face (uma face cobre 90° dos 360° da largura)."""
+    source = texture_cache.load(path, cache_dir, max_size=4 * face_size).levels[0]
+    faces = equirect_to_cubemap(np.asarray(source), face_size)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    bin_path, meta_path = _cube_paths(path, face_size, cache_dir)
+    faces.tofile(bin_path + ".tmp")
+    os.replace(bin_path + ".tmp", bin_path)
+    with open(meta_path, "w") as f:
+        json.dump({"source": os.path.abspath(path), "face_size": face_size,
+                   "shape": list(faces.shape)}, f, indent=1)
+    return faces
+
+
+def open_cubemap(path, face_size, cache_dir=texture_cache.CACHE_DIR):
+    """Faces em cache mapeadas em memória; None se não houver entrada válida."""
+    bin_path, meta_path = _cube_paths(path, face_size, cache_dir)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return np.memmap(bin_path, dtype=np.uint8, mode="r", shape=tuple(meta["shape"]))
+    except (OSError, ValueError):
+        return None
+
+
+def load_cubemap(path, face_size, cache_dir=texture_cache.CACHE_DIR):
+    faces = open_cubemap(path, face_size, cache_dir)
+    if faces is None:
+        faces = build_cubemap(path, face_size, cache_dir)
+    return faces
+
+
+# ======================
+# Céu desenhado como um triângulo de tela cheia
+# ======================
+SKY_VERT_SRC = """
+#version 120
+attribute vec2 aPosition;
+uniform mat4 uInvViewProj;   // inversa de projeção x rotação da câmera
+varying vec3 vDir;
+void main() {
+    vec4 p = uInvViewProj * vec4(aPosition, 1.0, 1.0);
+    vDir = p.xyz / p.w;
+    gl_Position = vec4(aPosition, 1.0, 1.0);
+}
+"""
+
+SKY_FRAG_SRC = """
+#version 120
+uniform samplerCube uSky;
+varying vec3 vDir;
+void main() {
+    gl_FragColor = textureCube(uSky, vDir);
+}
+"""
+
+
+def create_cubemap_texture(faces):
+    tex = glGenTextures(1)
+    state.bind_texture(tex, target=GL_TEXTURE_CUBE_MAP)
+    glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_CUBE_MAP, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    for param in (GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TEXTURE_WRAP_R):
+        glTexParameteri(GL_TEXTURE_CUBE_MAP, param, GL_CLAMP_TO_EDGE)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    size = faces.shape[1]
+    for i, face in enumerate(faces):
+        glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB, size, size, 0,
+                     GL_RGB, GL_UNSIGNED_BYTE, np.ascontiguousarray(face))
+    return tex
+
+
+class Skybox:
+    """Céu em cubemap: a conversão (ou leitura do cache) roda numa thread e o
+    desenho é um único triângulo que cobre a tela, sem malha de esfera.
+    """
+
+    _TRIANGLE = np.array([[-1.0, -1.0], [3.0, -1.0], [-1.0, 3.0]], dtype=np.float32)
+
+    def __init__(self, path, face_size=1024, cache_dir=texture_cache.CACHE_DIR):
+        self.path = path
+        self.face_size = face_size
+        self.texture = None
+        self.failed = False
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._future = self._pool.submit(load_cubemap, path, face_size, cache_dir)
+
+        self.program = create_program(SKY_VERT_SRC, SKY_FRAG_SRC, {"aPosition": 0})
+        state.use_program(self.program)
+        glUniform1i(uniform(self.program, "uSky"), 0)
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self._TRIANGLE.nbytes, self._TRIANGLE, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def pump(self):
+        """Cria a textura quando as faces ficam prontas (thread GL)."""
+        if self.texture or self.failed or not self._future.done():
+            return
+        try:
+            faces = self._future.result()
+        except Exception as e:
+            print(f"❌ Erro ao gerar o cubemap de '{self.path}': {e}")
+            self.failed = True
+            return
+        self.texture = create_cubemap_texture(faces)
+        print(f"✅ Céu em cubemap: {self.path} (6x{self.face_size}²)")
+
+    def draw(self, view, projection):
+        """Desenha o céu; espera o programa do céu já em uso (material da fila)."""
+        rotation = np.identity(4)
+        rotation[:3, :3] = view[:3, :3]  # só a rotação: o céu fica no infinito
+        inv = np.linalg.inv(projection @ rotation).astype(np.float32)
+        glUniformMatrix4fv(uniform(self.program, "uInvViewProj"), 1, GL_TRUE, inv)
+        state.bind_texture(self.texture, 0, GL_TEXTURE_CUBE_MAP)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glEnableVertexAttribArray(0)
+        glVertexAttribPointer(0, 2, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+        glDisableVertexAttribArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.texture:
+            glDeleteTextures([self.texture])
+            state.forget_texture(self.texture)
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteProgram(self.program)
+
+
+# ======================
+# Linha de comando: gera as faces em cache (e opcionalmente PNGs para conferir)
+# ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte uma imagem equiretangular em cubemap (cache em disco).")
+    parser.add_argument("path", nargs="?", default="textures/8k_stars_milky_way.jpg")
+    parser.add_argument("--size", type=int, default=1024, help="lado de cada face em pixels")
+    parser.add_argument("--cache-dir", default=texture_cache.CACHE_DIR)
+    parser.add_argument("--png-dir", help="salva também as seis faces como PNG nesta pasta")
+    args = parser.parse_args(argv)
+
+    faces = build_cubemap(args.path, args.size, args.cache_dir)
+    print(f"✅ Cubemap gerado: {args.path} (6x{args.size}², {faces.nbytes / 2**20:.1f} MB)")
+    if args.png_dir:
+        import pygame
+        os.makedirs(args.png_dir, exist_ok=True)
+        for name, face in zip(FACE_NAMES, faces):
+            # Linha 0 do GL é a de baixo: desvira para a imagem
+            surf = pygame.surfarray.make_surface(np.ascontiguousarray(face[::-1].transpose(1, 0, 2)))
+            out = os.path.join(args.png_dir, f"face{name.replace('+', 'pos').replace('-', 'neg')}.png")
+            pygame.image.save(surf, out)
+        print(f"✅ Faces salvas em {args.png_dir}")
+
+
+if __name__ == "__main__":
+    main()
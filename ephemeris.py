@@ -0,0 +1,252 @@
+import argparse
+import time
+
+import numpy as np
+
+
+# ======================
+# Efemérides keplerianas vetorizadas
+# ======================
+TWO_PI = 2.0 * np.pi
+
+
+def wrap_angle(x):
+    """Ângulo equivalente em [-π, π] (np.rint sai bem mais barato que np.mod em arrays grandes)."""
+    return x - TWO_PI * np.rint(x / TWO_PI)
+
+
+def solve_kepler(M, e, E0=None, tol=1e-9, max_iter=12):
+    """Resolve E - e·sin(E) = M para todos os corpos de uma vez (Newton vetorizado).
+
+    Cada iteração roda sobre o lote inteiro, em arrays pré-alocados: separar
+    só os corpos que ainda não convergiram custava mais em cópias do que as
+    contas que economizava. Como Newton converge quadraticamente, o erro
+    depois de um passo dE é da ordem de dE², então o laço para quando a
+    maior correção ao quadrado fica abaixo de `tol`.
+    `E0` é um chute inicial opcional (por exemplo, a solução do frame anterior).
+    """
+    M = wrap_angle(M)
+    E = M + e * np.sin(M) if E0 is None else np.array(E0, dtype=np.float64)
+    s = np.empty_like(E)
+    c = np.empty_like(E)
+    for _ in range(max_iter):
+        # dE = (E - e·sin E - M) / (1 - e·cos E), sem arrays temporários
+        np.sin(E, out=s)
+        np.cos(E, out=c)
+        s *= e
+        np.subtract(E, s, out=s)
+        s -= M
+        c *= e
+        np.subtract(1.0, c, out=c)
+        s /= c
+        E -= s
+        step = np.abs(s).max(initial=0.0)
+        if step * step < tol:
+            break
+    return E
+
+
+class Ephemeris:
+    """Elementos orbitais em estrutura de arrays e posições calculadas em lote.
+
+    Cada corpo tem semi-eixo maior, excentricidade, inclinação, nodo
+    ascendente, argumento do periastro, anomalia média na época e movimento
+    médio. Ângulos são dados em graus e o movimento médio em graus por segundo
+    de simulação. Corpos com `parent` orbitam o pai (luas); as posições são
+    somadas nível a nível da hierarquia, também de forma vetorizada.
+
+    As posições saem no sistema da cena (Y para cima): o plano orbital de
+    referência é o XZ e anomalia crescente gira como glRotatef(ang, 0,1,0).
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.a = np.zeros(0)
+        self.e = np.zeros(0)
+        self.M0 = np.zeros(0)
+        self.n = np.zeros(0)
+        self.parent = np.zeros(0, dtype=np.int64)
+        self._b = np.zeros(0)
+        self._P = np.zeros((0, 3))
+        self._Q = np.zeros((0, 3))
+        self._levels = []
+        self._warm = None  # (M, E) do último cálculo, chute inicial do próximo
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, names, a, e=0.0, inc=0.0, node=0.0, peri=0.0, mean_anomaly=0.0,
+            mean_motion=0.0, parent=None):
+        """Acrescenta um ou vários corpos; escalares são repetidos para todos. Devolve os índices."""
+        names = [names] if isinstance(names, str) else list(names)
+        count = len(names)
+
+        def arr(x):
+            return np.broadcast_to(np.asarray(x, dtype=np.float64), (count,)).copy()
+
+        inc, node, peri = np.radians(arr(inc)), np.radians(arr(node)), np.radians(arr(peri))
+        if parent is None:
+            parents = np.full(count, -1)
+        elif isinstance(parent, str):
+            parents = np.full(count, self.index[parent])
+        else:
+            parents = np.array([self.index[p] if isinstance(p, str) else p for p in parent])
+
+        first = len(self.names)
+        for i, name in enumerate(names):
+            self.index[name] = first + i
+        self.names.extend(names)
+        self.a = np.concatenate([self.a, arr(a)])
+        self.e = np.concatenate([self.e, arr(e)])
+        self._b = self.a * np.sqrt(1.0 - self.e * self.e)  # semi-eixo menor
+        self.M0 = np.concatenate([self.M0, np.radians(arr(mean_anomaly))])
+        self.n = np.concatenate([self.n, np.radians(arr(mean_motion))])
+        self.parent = np.concatenate([self.parent, parents.astype(np.int64)])
+
+        # Vetores P (periastro) e Q do plano orbital, fixos por corpo
+        cO, sO = np.cos(node), np.sin(node)
+        cw, sw = np.cos(peri), np.sin(peri)
+        ci, si = np.cos(inc), np.sin(inc)
+        # já trocados de eclíptica (Z para cima) para a cena (Y para cima): (x, y, z) -> (x, z, -y)
+        P = np.stack([cO * cw - sO * sw * ci, sw * si, -(sO * cw + cO * sw * ci)], axis=-1)
+        Q = np.stack([-cO * sw - sO * cw * ci, cw * si, -(-sO * sw + cO * cw * ci)], axis=-1)
+        self._P = np.concatenate([self._P, P])
+        self._Q = np.concatenate([self._Q, Q])
+        self._levels = self._hierarchy_levels()
+        self._warm = None
+        return np.arange(first, first + count)
+
+    def _hierarchy_levels(self):
+        """Índices agrupados por profundidade (1 = luas dos corpos raiz, ...)."""
+        depth = np.zeros(len(self.parent), dtype=np.int64)
+        cur = self.parent.copy()
+        while np.any(cur >= 0):
+            up = cur >= 0
+            depth[up] += 1
+            cur[up] = self.parent[cur[up]]
+        return [np.flatnonzero(depth == d) for d in range(1, int(depth.max(initial=0)) + 1)]
+
+    def eccentric_anomaly(self, t):
+        """Anomalia excêntrica (rad) de cada corpo no tempo t (segundos de simulação)."""
+        M = wrap_angle(self.M0 + self.n * t)
+        E0 = None
+        if self._warm is not None:
+            # Entre frames M muda pouco: extrapola a solução anterior (dE = dM / (1 - e·cos E))
+            M_prev, E_prev = self._warm
+            dM = wrap_angle(M - M_prev)
+            # Quando M dá a volta (π -> -π) o chute acompanha, senão Newton parte do ramo errado
+            E0 = E_prev + dM / (1.0 - self.e * np.cos(E_prev)) + (M - M_prev - dM)
+            far = np.flatnonzero(np.abs(dM) >= 0.5)  # salto no tempo: volta ao chute padrão
+            if len(far):
+                E0[far] = M[far] + self.e[far] * np.sin(M[far])
+        E = solve_kepler(M, self.e, E0)
+        self._warm = (M, E)
+        return E
+
+    def subset(self, bodies):
+        """Novo Ephemeris só com `bodies` e seus ancestrais, na ordem original (pais antes dos filhos)."""
+        keep = set(int(i) for i in np.atleast_1d(bodies))
+        for i in list(keep):
+            p = self.parent[i]
+            while p >= 0:
+                keep.add(int(p))
+                p = self.parent[p]
+        keep = np.array(sorted(keep), dtype=np.int64)
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+
+        sub = Ephemeris()
+        sub.names = [self.names[i] for i in keep]
+        sub.index = {name: k for k, name in enumerate(sub.names)}
+        for attr in ("a", "e", "_b", "M0", "n", "_P", "_Q"):
+            setattr(sub, attr, getattr(self, attr)[keep])
+        parent = self.parent[keep]
+        sub.parent = np.where(parent >= 0, remap[parent], -1)
+        sub._levels = sub._hierarchy_levels()
+        return sub
+
+    def orbit_axes(self, bodies=None):
+        """Semi-eixos de cada órbita no sistema da cena: (P·a, Q·b), ambos (n, 3).
+
+        A posição relativa ao pai é P·a·(cos E - e) + Q·b·sin E.
+        """
+        idx = slice(None) if bodies is None else np.asarray(bodies)
+        return self._P[idx] * self.a[idx, None], self._Q[idx] * self._b[idx, None]
+
+    def _to_scene(self, x, y):
+        """Coordenadas (x, y) no plano orbital -> sistema da cena."""
+        pos = self._P * x[:, None]
+        pos += self._Q * y[:, None]
+        return pos
+
+    def local_positions(self, t):
+        """Posição de cada corpo relativa ao pai no tempo t (segundos de simulação)."""
+        E = self.eccentric_anomaly(t)
+        x = np.cos(E)
+        x -= self.e
+        x *= self.a
+        y = np.sin(E)
+        y *= self._b
+        return self._to_scene(x, y)
+
+    def positions(self, t):
+        """Posições no mundo de todos os corpos no tempo t, com a hierarquia resolvida."""
+        pos = self.local_positions(t)
+        for idx in self._levels:
+            pos[idx] += pos[self.parent[idx]]
+        return pos
+
+    def state_vectors(self, t):
+        """Posições e velocidades (unidades por segundo) no mundo no tempo t."""
+        E = self.eccentric_anomaly(t)
+        cE, sE = np.cos(E), np.sin(E)
+        b = self._b
+        dE = self.n / (1.0 - self.e * cE)  # derivada de Kepler: dE/dt = n / (1 - e·cos E)
+        pos = self._to_scene(self.a * (cE - self.e), b * sE)
+        vel = self._to_scene(-self.a * sE * dE, b * cE * dE)
+        for idx in self._levels:
+            pos[idx] += pos[self.parent[idx]]
+            vel[idx] += vel[self.parent[idx]]
+        return pos, vel
+
+
+# ======================
+# Benchmark: posições por segundo
+# ======================
+def random_population(count, seed=0, a_range=(13.5, 19.5)):
+    """Efemérides com `count` corpos menores em órbitas aleatórias (cinturão)."""
+    rng = np.random.default_rng(seed)
+    eph = Ephemeris()
+    a = rng.uniform(*a_range, count)
+    eph.add([f"body{i}" for i in range(count)], a,
+            e=rng.uniform(0.0, 0.3, count),
+            inc=rng.normal(0.0, 5.0, count),
+            node=rng.uniform(0.0, 360.0, count),
+            peri=rng.uniform(0.0, 360.0, count),
+            mean_anomaly=rng.uniform(0.0, 360.0, count),
+            mean_motion=30.0 * (13.0 / a) ** 1.5)  # terceira lei de Kepler a partir de Marte (a = 13)
+    return eph
+
+
+def benchmark(counts=(100, 1_000, 10_000, 100_000, 1_000_000), repeats=20):
+    for count in counts:
+        eph = random_population(count)
+        eph.positions(0.0)
+        start = time.perf_counter()
+        for k in range(repeats):
+            eph.positions(k / 60.0)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{count:>9} corpos: {elapsed * 1000:8.3f} ms/frame  {count / elapsed:14,.0f} posições/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do solver de Kepler vetorizado.")
+    parser.add_argument("--counts", type=int, nargs="*", default=[100, 1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+    benchmark(args.counts, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
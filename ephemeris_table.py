@@ -0,0 +1,136 @@
+import argparse
+import struct
+import time
+
+import numpy as np
+
+
+# ======================
+# Tabela de efemérides pré-calculada
+# ======================
+# Layout do arquivo:
+#   cabeçalho fixo (_HEADER) — magic, versão, nº de corpos, nº de amostras,
+#                              t0, passo, tamanho dos nomes, início dos dados
+#   nomes dos corpos em UTF-8 separados por "\n"
+#   (preenchimento até múltiplo de PAGE)
+#   dados float32 (amostras, corpos, 6): posição xyz e velocidade xyz
+# Amostra k corresponde a t0 + k·passo. Cada amostra fica contígua, então
+# consultar um instante lê só duas amostras vizinhas do disco.
+MAGIC = b"EPHTAB\0\0"
+VERSION = 1
+PAGE = 4096
+_HEADER = struct.Struct("<8sIIQddQQ")
+
+
+def sample_count(t_start, t_end, step):
+    """Número de amostras de t_start a t_end (inclusive) a cada `step` segundos."""
+    return int(np.floor((t_end - t_start) / step + 1e-9)) + 1
+
+
+def table_size(bodies, t_start, t_end, step):
+    """Bytes de dados de uma tabela com `bodies` corpos nesse intervalo (sem o cabeçalho)."""
+    return sample_count(t_start, t_end, step) * bodies * 6 * np.dtype(np.float32).itemsize
+
+
+def build_table(eph, path, t_start, t_end, step, progress=True):
+    """Amostra posições e velocidades de `eph` de t_start a t_end e grava em `path`.
+
+    As amostras são escritas uma a uma, então a memória usada não depende do
+    tamanho da tabela. Devolve o número de amostras.
+    """
+    count = sample_count(t_start, t_end, step)
+    if count < 2:
+        raise ValueError("o intervalo precisa de pelo menos duas amostras")
+    names = "\n".join(eph.names).encode("utf-8")
+    data_offset = -(-(_HEADER.size + len(names)) // PAGE) * PAGE
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(eph), count, t_start, step, len(names), data_offset))
+        f.write(names)
+        f.write(b"\0" * (data_offset - f.tell()))
+        sample = np.empty((len(eph), 6), dtype=np.float32)
+        start = time.perf_counter()
+        for k in range(count):
+            sample[:, :3], sample[:, 3:] = eph.state_vectors(t_start + k * step)
+            f.write(sample.tobytes())
+            if progress and (k % 500 == 0 or k == count - 1):
+                done = (k + 1) / count
+                eta = (time.perf_counter() - start) / done * (1.0 - done)
+                print(f"\r   {k + 1}/{count} amostras ({done:6.1%}, faltam {eta:5.0f} s)", end="", flush=True)
+    if progress:
+        print()
+    return count
+
+
+class EphemerisTable:
+    """Tabela gravada por build_table, mapeada em memória.
+
+    positions(t) acha as duas amostras vizinhas por aritmética (O(1), sem
+    busca) e interpola com Hermite cúbico usando as velocidades gravadas;
+    só as páginas dessas amostras são lidas do disco.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            magic, version, bodies, samples, t0, step, names_size, data_offset = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"'{path}' não é uma tabela de efemérides (versão {VERSION})")
+            self.names = f.read(names_size).decode("utf-8").split("\n")
+        self.t0 = t0
+        self.step = step
+        self.samples = samples
+        self.data = np.memmap(path, dtype=np.float32, mode="r", offset=data_offset, shape=(samples, bodies, 6))
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def t_end(self):
+        return self.t0 + (self.samples - 1) * self.step
+
+    def covers(self, t):
+        return self.t0 <= t <= self.t_end
+
+    def positions(self, t, bodies=None):
+        """Posições em t de todos os corpos, ou só de `bodies` (fora do intervalo, o extremo mais próximo)."""
+        u = min(max((t - self.t0) / self.step, 0.0), self.samples - 1.0)
+        i = min(int(u), self.samples - 2)
+        s = u - i
+        a, b = self.data[i], self.data[i + 1]
+        if bodies is not None:
+            bodies = np.asarray(bodies)
+            a, b = a[bodies], b[bodies]
+
+        # Bases de Hermite; as tangentes são velocidade × passo
+        s2, s3 = s * s, s * s * s
+        h00 = 2.0 * s3 - 3.0 * s2 + 1.0
+        h10 = (s3 - 2.0 * s2 + s) * self.step
+        h01 = -2.0 * s3 + 3.0 * s2
+        h11 = (s3 - s2) * self.step
+        return (h00 * a[:, :3] + h10 * a[:, 3:] + h01 * b[:, :3] + h11 * b[:, 3:]).astype(np.float64)
+
+
+# ======================
+# Linha de comando: resumo da tabela e tempo de consulta
+# ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mostra o cabeçalho de uma tabela de efemérides e mede consultas.")
+    parser.add_argument("path")
+    parser.add_argument("--seeks", type=int, default=200, help="consultas em instantes aleatórios")
+    args = parser.parse_args(argv)
+
+    table = EphemerisTable(args.path)
+    print(f"✅ {args.path}: {len(table)} corpos, {table.samples} amostras de {table.step:g} s "
+          f"(t = {table.t0:g} a {table.t_end:g} s), {table.data.nbytes / 2**30:.2f} GB")
+    times = np.random.default_rng(0).uniform(table.t0, table.t_end, args.seeks)
+    start = time.perf_counter()
+    for t in times:
+        table.positions(t)
+    elapsed = (time.perf_counter() - start) / args.seeks
+    print(f"   consulta em instante aleatório: {elapsed * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import ctypes
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+
+# ======================
+# Framebuffer fora da tela
+# ======================
+class OffscreenTarget:
+    """FBO com cor RGBA8 e profundidade de 24 bits, em qualquer resolução."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.fbo = glGenFramebuffers(1)
+        self.color, self.depth = glGenRenderbuffers(2)
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.depth)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status not in (GL_FRAMEBUFFER_COMPLETE, None):  # None: backend falso do profiler
+            raise RuntimeError(f"Framebuffer incompleto (0x{status:x}) em {width}x{height}")
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def unbind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def delete(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(2, [self.color, self.depth])
+
+
+# ======================
+# Leitura assíncrona com PBOs
+# ======================
+class PixelReader:
+    """Lê o framebuffer com dois pixel buffer objects alternados.
+
+    read() agenda o glReadPixels do frame atual num PBO (a cópia roda na GPU)
+    e mapeia o PBO do frame anterior, que a essa altura já terminou; assim a
+    CPU nunca espera pelo frame que acabou de ser desenhado.
+    """
+
+    def __init__(self, width, height, buffers=2):
+        self.width = width
+        self.height = height
+        self.nbytes = width * height * 4
+        self.pbos = [int(pbo) for pbo in np.atleast_1d(glGenBuffers(buffers))]
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.nbytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending = []  # (índice do frame, pbo) na ordem de leitura
+
+    def read(self, index):
+        """Agenda a leitura do frame `index`; devolve (índice, pixels) do mais antigo pronto, ou None."""
+        pbo = self.pbos[index % len(self.pbos)]
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append((index, pbo))
+        if len(self._pending) < len(self.pbos):
+            return None
+        return self._map(*self._pending.pop(0))
+
+    def finish(self):
+        """Frames ainda nos PBOs, em ordem."""
+        done = [self._map(index, pbo) for index, pbo in self._pending]
+        self._pending = []
+        return done
+
+    def _map(self, index, pbo):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        ptr = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        if ptr:
+            pixels = np.ctypeslib.as_array((ctypes.c_ubyte * self.nbytes).from_address(ptr)).copy()
+            glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        else:  # backend falso do profiler: quadro preto
+            pixels = np.zeros(self.nbytes, dtype=np.uint8)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        # glReadPixels entrega a linha de baixo primeiro
+        return index, pixels.reshape(self.height, self.width, 4)[::-1]
+
+    def delete(self):
+        glDeleteBuffers(len(self.pbos), self.pbos)
+
+
+# ======================
+# Gravação em segundo plano
+# ======================
+class FrameWriter:
+    """Grava os frames fora da thread GL: PNGs numerados ou vídeo via ffmpeg.
+
+    `out` terminado em .mp4/.mkv/.mov/.webm vira vídeo (frames RGBA crus pelo
+    stdin do ffmpeg); qualquer outro caminho é uma pasta de PNGs. A fila é
+    limitada, então se o disco/encoder for mais lento que a GPU o laço de
+    render espera em vez de acumular memória.
+    """
+
+    VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm")
+
+    def __init__(self, out, width, height, fps=60, workers=2, max_queued=8):
+        self.out = out
+        self.width = width
+        self.height = height
+        self.written = 0
+        self.errors = []
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._lock = threading.Lock()
+        self._encoder = None
+
+        if out.lower().endswith(self.VIDEO_EXTENSIONS):
+            ffmpeg = shutil.which("ffmpeg")
+            if not ffmpeg:
+                raise RuntimeError("ffmpeg não encontrado no PATH (use uma pasta para gravar PNGs)")
+            self._encoder = subprocess.Popen(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                 "-pix_fmt", "yuv420p", out],
+                stdin=subprocess.PIPE)
+            workers = 1  # o stdin do ffmpeg precisa dos frames em ordem
+        else:
+            os.makedirs(out, exist_ok=True)
+
+        self._threads = [threading.Thread(target=self._run, name=f"frame-writer-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def put(self, index, pixels):
+        self._queue.put((index, pixels))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, pixels = item
+            try:
+                if self._encoder:
+                    self._encoder.stdin.write(np.ascontiguousarray(pixels).tobytes())
+                else:
+                    surf = pygame.image.frombuffer(np.ascontiguousarray(pixels).tobytes(),
+                                                   (self.width, self.height), "RGBA")
+                    pygame.image.save(surf, os.path.join(self.out, f"frame_{index:06d}.png"))
+            except Exception as e:
+                self.errors.append(e)
+                continue
+            with self._lock:
+                self.written += 1
+
+    def close(self):
+        """Espera a fila esvaziar e fecha o encoder."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        if self._encoder:
+            self._encoder.stdin.close()
+            self._encoder.wait()
+            if self._encoder.returncode:
+                self.errors.append(RuntimeError(f"ffmpeg terminou com código {self._encoder.returncode}"))
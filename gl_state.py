@@ -0,0 +1,97 @@
+from OpenGL.GL import *
+
+
+# ======================
+# Cache do estado GL
+# ======================
+class GLState:
+    """Sombra em Python do estado GL mais trocado no frame.
+
+    Guarda o programa em uso, a unidade de textura ativa, a textura ligada em
+    cada unidade, os flags de glEnable/glDisable e a função de blend. Cada
+    mudança que já corresponde ao estado atual é descartada sem chamar o
+    driver. Código que mexe nesses estados por fora deve chamar invalidate().
+    """
+
+    def __init__(self):
+        self.issued = 0
+        self.skipped = 0
+        self.invalidate()
+
+    def invalidate(self):
+        """Esquece tudo; as próximas mudanças vão ao driver."""
+        self._program = None
+        self._active_unit = None
+        self._textures = {}
+        self._caps = {}
+        self._blend = None
+
+    def reset_counters(self):
+        self.issued = 0
+        self.skipped = 0
+
+    def _count(self, changed):
+        if changed:
+            self.issued += 1
+        else:
+            self.skipped += 1
+        return changed
+
+    def use_program(self, program):
+        if self._count(program != self._program):
+            glUseProgram(program)
+            self._program = program
+
+    def active_texture(self, unit):
+        if self._count(unit != self._active_unit):
+            glActiveTexture(GL_TEXTURE0 + unit)
+            self._active_unit = unit
+
+    def bind_texture(self, tex, unit=None, target=GL_TEXTURE_2D):
+        """Liga `tex` na unidade `unit` (None = unidade ativa)."""
+        if unit is not None:
+            self.active_texture(unit)
+        elif self._active_unit is None:
+            self.active_texture(0)
+        key = (self._active_unit, target)
+        tex = tex or 0
+        if self._count(self._textures.get(key) != tex):
+            glBindTexture(target, tex)
+            self._textures[key] = tex
+
+    def forget_texture(self, tex):
+        """Depois de glDeleteTextures: o driver volta essas ligações para 0."""
+        for key, bound in self._textures.items():
+            if bound == tex:
+                self._textures[key] = 0
+
+    def _cap_key(self, cap):
+        # GL_TEXTURE_2D do pipeline fixo é ligado por unidade de textura
+        if cap == GL_TEXTURE_2D:
+            if self._active_unit is None:
+                self.active_texture(0)
+            return cap, self._active_unit
+        return cap
+
+    def enable(self, cap):
+        key = self._cap_key(cap)
+        if self._count(self._caps.get(key) is not True):
+            glEnable(cap)
+            self._caps[key] = True
+
+    def disable(self, cap):
+        key = self._cap_key(cap)
+        if self._count(self._caps.get(key) is not False):
+            glDisable(cap)
+            self._caps[key] = False
+
+    def blend_func(self, src, dst):
+        if self._count(self._blend != (src, dst)):
+            glBlendFunc(src, dst)
+            self._blend = (src, dst)
+
+    def summary(self):
+        return f"estado GL: {self.issued} enviadas, {self.skipped} evitadas"
+
+
+state = GLState()
@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+
+
+# ======================
+# Nível de detalhe (LOD)
+# ======================
+# (slices, stacks, diâmetro mínimo em pixels para usar o nível)
+LOD_LEVELS = [
+    (8, 6, 0.0),
+    (16, 12, 8.0),
+    (32, 24, 32.0),
+    (64, 64, 128.0),
+]
+
+
+class LodSelector:
+    """Escolhe a resolução da esfera pelo tamanho projetado do corpo na tela."""
+
+    def __init__(self, fovy, viewport_height, levels=LOD_LEVELS):
+        self.levels = levels
+        self.thresholds = np.array([lvl[2] for lvl in levels])
+        # pixels por unidade de mundo a distância 1
+        self.pixel_scale = viewport_height / (2.0 * math.tan(math.radians(fovy) / 2.0))
+
+    def screen_diameter(self, radii, distances):
+        """Diâmetro aproximado em pixels de esferas de raio `radii` a `distances` da câmera."""
+        distances = np.maximum(distances, 1e-6)
+        return 2.0 * np.asarray(radii) * self.pixel_scale / distances
+
+    def select(self, radii, distances):
+        """Índice do nível de LOD de cada corpo (vetorizado)."""
+        px = self.screen_diameter(radii, distances)
+        return np.searchsorted(self.thresholds, px, side="right") - 1
+
+    def resolution(self, level):
+        slices, stacks, _ = self.levels[level]
+        return slices, stacks
+
+
+# ======================
+# Frustum culling
+# ======================
+class Frustum:
+    """Seis planos do volume de visão extraídos de projeção * view."""
+
+    def __init__(self, view_proj):
+        m = np.asarray(view_proj)
+        planes = np.array([
+            m[3] + m[0], m[3] - m[0],  # esquerda, direita
+            m[3] + m[1], m[3] - m[1],  # baixo, cima
+            m[3] + m[2], m[3] - m[2],  # perto, longe
+        ])
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+        self.planes = planes
+
+    def spheres_visible(self, centers, radii):
+        """True para cada esfera que intersecta ou está dentro do frustum."""
+        dist = np.asarray(centers) @ self.planes[:, :3].T + self.planes[:, 3]
+        return np.all(dist >= -np.asarray(radii)[:, None], axis=1)
+
+
+class LodStats:
+    """Contadores por frame de corpos desenhados, descartados e por nível de LOD."""
+
+    def __init__(self, n_levels=len(LOD_LEVELS)):
+        self.n_levels = n_levels
+        self.reset()
+
+    def reset(self):
+        self.drawn = 0
+        self.culled = 0
+        self.per_level = [0] * self.n_levels
+
+    def record(self, visible, levels):
+        visible = np.asarray(visible)
+        self.culled += int(np.count_nonzero(~visible))
+        self.drawn += int(np.count_nonzero(visible))
+        counts = np.bincount(np.asarray(levels)[visible], minlength=self.n_levels)
+        for i, c in enumerate(counts[:self.n_levels]):
+            self.per_level[i] += int(c)
+
+    def summary(self):
+        levels = " ".join(f"L{i}:{c}" for i, c in enumerate(self.per_level))
+        return f"desenhados {self.drawn} | descartados {self.culled} | {levels}"
@@ -2,8 +2,31 @@ import pygame
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
-import random
-import math
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+from meshes import OrbitBatch, get_sphere, get_ring, release_meshes
+from camera import FOVY, NEAR, FAR, camera_eye, look_at, perspective, scripted_camera
+from lod import LodSelector, Frustum, LodStats
+from textures import TextureLoader
+from texture_residency import TextureResidency
+from simulation import Simulation
+from ephemeris import Ephemeris
+from ephemeris_table import EphemerisTable, build_table, table_size
+from shaders import create_program, uniform
+from gl_state import state
+from cubemap import Skybox
+from picking import SphereBVH, camera_ray
+from scene_graph import SceneGraph, translation, rotation, scaling
+from render_queue import RenderQueue, Material, PASS_SKY, PASS_OPAQUE, PASS_LINES, PASS_TRANSPARENT
+from asteroids import InstancedBodies, add_asteroid_belt, add_minor_moons, random_appearance
+from profiler import FrameProfiler, GLCallCounter, draw_overlay
+from frame_export import OffscreenTarget, PixelReader, FrameWriter
 
 
 # ======================
@@ -22,56 +45,88 @@ cam_angle_y = 180.0
 cam_distance = 80.0
 mouse_sensitivity = 0.2
 zoom_speed = 2.0
+orbit_segments = 256
+ring_segments = 256
+texture_budget_mb = 512.0
+sky_face_size = 1024    # lado das faces do cubemap do céu
+max_fps = 60        # 0 = sem limite; a simulação não depende disso
+sim_hz = 60.0       # passos de simulação por segundo
+time_scale = 1.0    # acelerador de tempo ([ e ] durante a execução)
+seek_step = 600.0   # salto de PageUp/PageDown sem tabela (segundos de simulação)
+pick_min_radius = 0.15  # raio mínimo de seleção, para dar para clicar nos corpos minúsculos
+asteroid_count = 100_000
+minor_moon_count = 64   # por planeta gigante
+table_range = (0.0, 36_000.0)  # intervalo padrão da tabela (segundos de simulação, ~1000 órbitas de Netuno)
+table_step = 0.1               # ~75 MB: a tabela só guarda os corpos principais
+table_max_gb = 2.0             # --build-table recusa tabelas maiores que isso
+
+# Estado da câmera calculado em set_camera() (usado por LOD e culling)
+cam_eye = None
+cam_view = None
+
+TEXTURE_FILES = {
+    "sun": "textures/sol.jpg",
+    "earth": "textures/earth.jpg",
+    "earth_normal": "textures/normal_map_earth.tif",
+    "moon": "textures/8k_moon.jpg",
+    "mars": "textures/8k_mars.jpg",
+    "mercury": "textures/8k_mercury.jpg",
+    "venus": "textures/8k_venus_surface.jpg",
+    "jupiter": "textures/8k_jupiter.jpg",
+    "saturn": "textures/8k_saturn.jpg",
+    "uranus": "textures/2k_uranus.jpg",
+    "neptune": "textures/2k_neptune.jpg",
+    "saturn_ring": "textures/8k_saturn_ring.png",
+}
+SKY_FILE = "textures/8k_stars_milky_way.jpg"  # convertido para cubemap
+
+# Cores lisas usadas enquanto a textura do corpo não chega
+PLACEHOLDER_COLORS = {
+    "mercury": (0.55, 0.53, 0.50),
+    "venus": (0.85, 0.75, 0.55),
+    "earth": (0.25, 0.45, 0.75),
+    "mars": (0.75, 0.40, 0.25),
+    "jupiter": (0.80, 0.70, 0.55),
+    "saturn": (0.85, 0.78, 0.60),
+    "uranus": (0.60, 0.80, 0.85),
+    "neptune": (0.35, 0.50, 0.85),
+    "moon": (0.8, 0.8, 0.8),
+}
 
 
 # ======================
 # Utilidades
 # ======================
-def load_texture(path):
-    try:
-        surf = pygame.image.load(path)
-    except Exception as e:
-        print(f"❌ Erro ao carregar textura '{path}': {e}")
-        return None
-    surf = pygame.transform.flip(surf, False, True)
-    data = pygame.image.tostring(surf, "RGB", 1)
-    w, h = surf.get_rect().size
-
-    tex = glGenTextures(1)
-    glBindTexture(GL_TEXTURE_2D, tex)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, w, h, 0, GL_RGB, GL_UNSIGNED_BYTE, data)
-    print(f"✅ Textura carregada: {path} ({w}x{h})")
-    return tex
-
-
-def draw_sphere_color(radius, color):
-    glColor3fv(color)
-    q = gluNewQuadric()
-    gluSphere(q, radius, 32, 32)
+def draw_body(model, slices=32, stacks=32, color=None):
+    """Esfera unitária com a matriz de mundo `model` do grafo de cena (raio já incluído).
 
+    `color` para corpos sem textura.
+    """
+    glPushMatrix()
+    glMultMatrixd(np.ascontiguousarray(model.T))
+    if color is not None:
+        glColor3fv(color)
+    get_sphere(slices, stacks).draw()
+    if color is not None:
+        glColor3f(1.0, 1.0, 1.0)
+    glPopMatrix()
 
-def set_camera():
-    global cam_angle_x, cam_angle_y
+
+def set_camera(target=(0.0, 0.0, 0.0)):
+    """Câmera orbital em torno de `target` (o Sol, ou o corpo em foco)."""
+    global cam_angle_x, cam_angle_y, cam_eye, cam_view
     cam_angle_x = max(-89.0, min(89.0, cam_angle_x))
     cam_angle_y = cam_angle_y % 360.0
 
-    rad_x = math.radians(cam_angle_x)
-    rad_y = math.radians(cam_angle_y)
-
-    x = cam_distance * math.cos(rad_x) * math.sin(rad_y)
-    y = cam_distance * math.sin(rad_x)
-    z = cam_distance * math.cos(rad_x) * math.cos(rad_y)
+    cam_eye = np.asarray(target) + camera_eye(cam_angle_x, cam_angle_y, cam_distance)
 
     # Up dinâmico para evitar inversão
     up_y = 1.0 if -90 < cam_angle_x < 90 else -1.0
+    cam_view = look_at(cam_eye, target, (0, up_y, 0))
 
+    # Matriz calculada na CPU: nada precisa ser lido de volta do driver
     glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
-    gluLookAt(x, y, z, 0, 0, 0, 0, up_y, 0)
+    glLoadMatrixd(np.ascontiguousarray(cam_view.T))
 
 
 
@@ -129,317 +184,612 @@ void main() {
 """
 
 
-def compile_shader(src, stype):
-    sid = glCreateShader(stype)
-    glShaderSource(sid, src)
-    glCompileShader(sid)
-    if not glGetShaderiv(sid, GL_COMPILE_STATUS):
-        raise RuntimeError(glGetShaderInfoLog(sid).decode())
-    return sid
+def draw_orbits(orbits, color=(0.3, 0.3, 0.3)):
+    """Desenha todas as linhas circulares das órbitas dos planetas de uma vez."""
+    glColor3fv(color)
+    orbits.draw()
+    glColor3f(1.0, 1.0, 1.0)
 
 
-def create_program(vsrc, fsrc):
-    vs = compile_shader(vsrc, GL_VERTEX_SHADER)
-    fs = compile_shader(fsrc, GL_FRAGMENT_SHADER)
-    pid = glCreateProgram()
-    glAttachShader(pid, vs)
-    glAttachShader(pid, fs)
-    glLinkProgram(pid)
-    if not glGetProgramiv(pid, GL_LINK_STATUS):
-        raise RuntimeError(glGetProgramInfoLog(pid).decode())
-    glDeleteShader(vs)
-    glDeleteShader(fs)
-    return pid
+def draw_highlight(center, radius, color=(1.0, 1.0, 0.0)):
+    """Esfera em arame em volta do corpo selecionado."""
+    glPushMatrix()
+    glTranslatef(*center)
+    glScalef(radius, radius, radius)
+    glColor3fv(color)
+    glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
+    get_sphere(16, 12).draw()
+    glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
+    glColor3f(1.0, 1.0, 1.0)
+    glPopMatrix()
 
 
-def draw_skybox(texture_id):
-    """Desenha uma esfera invertida com textura de estrelas ao fundo."""
+def draw_saturn_rings(model, inner_radius, outer_radius, textured=False, segments=128):
+    """Desenha os anéis de Saturno com gradiente de transparência (textura vem do material)."""
     glPushMatrix()
-    glDisable(GL_LIGHTING)
-    glDisable(GL_DEPTH_TEST)
-    glDisable(GL_CULL_FACE)
-    glEnable(GL_TEXTURE_2D)
-
-    glBindTexture(GL_TEXTURE_2D, texture_id)
-    q = gluNewQuadric()
-    gluQuadricTexture(q, GL_TRUE)
-    gluQuadricOrientation(q, GLU_INSIDE)  # Inverte a esfera (olhar de dentro)
-    gluSphere(q, 200.0, 64, 64)  # Raio bem grande
-    
-    glEnable(GL_DEPTH_TEST)
-    glEnable(GL_CULL_FACE)
-    glEnable(GL_LIGHTING)
+    glMultMatrixd(np.ascontiguousarray(model.T))
+    get_ring(inner_radius, outer_radius, segments, textured=textured).draw()
+    glColor4f(1.0, 1.0, 1.0, 1.0)
     glPopMatrix()
 
 
-def draw_orbit(radius, color=(0.3, 0.3, 0.3), segments=128):
-    """Desenha uma linha circular representando a órbita de um planeta."""
-    was_program = glGetIntegerv(GL_CURRENT_PROGRAM)
-    tex_enabled = glIsEnabled(GL_TEXTURE_2D)
+PLANETS = [
+    ("mercury", 3.5, 0.25, 1.6, "mercury"),
+    ("venus", 5.5, 0.45, 1.2, "venus"),
+    ("earth", 8.0, 0.8, 0.8, "earth"),
+    ("mars", 13.0, 0.6, 0.5, "mars"),
+    ("jupiter", 20.0, 1.5, 0.3, "jupiter"),
+    ("saturn", 26.0, 1.2, 0.25, "saturn"),
+    ("uranus", 31.0, 0.9, 0.2, "uranus"),
+    ("neptune", 36.0, 0.85, 0.18, "neptune")
+]
+
+
+def build_ephemeris():
+    """Efemérides de todos os corpos da cena. Devolve (Ephemeris, índices dos corpos menores)."""
+    # Órbitas circulares no plano XZ; a Lua orbita a Terra no referencial do mundo
+    eph = Ephemeris()
+    for name, orbit_radius, _, orbit_speed, _ in PLANETS:
+        eph.add(name, orbit_radius, mean_motion=orbit_speed * 60.0)
+    eph.add("moon", 1.5, mean_motion=(0.8 + 2.0) * 60.0, parent="earth")
+
+    # Cinturão de asteroides e luas menores, desenhados por instanciamento
+    minor = np.concatenate([
+        add_asteroid_belt(eph, asteroid_count, a_range=(14.0, 19.0)),
+        add_minor_moons(eph, "jupiter", minor_moon_count, a_range=(2.0, 4.0)),
+        add_minor_moons(eph, "saturn", minor_moon_count, a_range=(3.2, 5.0), seed=4),
+    ])
+    return eph, minor
+
+
+def major_bodies(eph, minor):
+    """Índices dos corpos resolvidos na CPU a cada frame (planetas e Lua), em ordem."""
+    return tuple(int(i) for i in np.setdiff1d(np.arange(len(eph)), minor))
+
+
+class Scene:
+    """Estado da cena criado uma vez: configuração GL, texturas, simulação e malhas."""
+
+    def __init__(self, size, table_path=None):
+        self.size = size
+
+        # OpenGL setup
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        gluPerspective(FOVY, size[0] / float(size[1]), NEAR, FAR)
+        self.projection = perspective(FOVY, size[0] / float(size[1]), NEAR, FAR)
+        self.lod = LodSelector(FOVY, size[1])
+        self.lod_stats = LodStats()
+        self.frame = 0
+        glMatrixMode(GL_MODELVIEW)
+        state.invalidate()  # contexto novo
+        state.enable(GL_DEPTH_TEST)
+        state.enable(GL_TEXTURE_2D)
+        state.disable(GL_LIGHTING)
+        state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glEnable(GL_NORMALIZE)  # malhas unitárias escaladas pelo raio
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        glClearColor(0.0, 0.0, 0.0, 1.0)
+
+        # Texturas (decodificadas em segundo plano, enviadas à GPU aos poucos)
+        self.textures = TextureLoader()
+        self.residency = TextureResidency(self.textures, budget_mb=texture_budget_mb)
+        for key, path in TEXTURE_FILES.items():
+            self.textures.request(key, path)
+        self.skybox = Skybox(SKY_FILE, sky_face_size)
+
+        # Shader da Terra
+        self.program = create_program(VERT_SRC, FRAG_SRC)
+        state.use_program(self.program)
+        glUniform1i(uniform(self.program, "uDiffuse"), 0)
+        glUniform1i(uniform(self.program, "uNormalMap"), 1)
+
+        self.planets = planets = PLANETS
+
+        # Velocidades em graus por passo de 1/60 s, como antes eram por frame
+        self.body_names = body_names = [p[0] for p in planets] + ["moon", "sun"]
+        orbit_rates = [p[3] * 60.0 for p in planets] + [2.0 * 60.0, 0.0]
+        spin_rates = [1.0 * 60.0 if name == "earth" else 0.0 for name in body_names]
+        spin_rates[-1] = 0.2 * 60.0
+        self.sim = Simulation(body_names, orbit_rates, spin_rates, dt=1.0 / sim_hz, time_scale=time_scale)
+
+        self.eph, self.minor = build_ephemeris()
+        # Corpos menores são avaliados no shader; a CPU só resolve os principais a cada frame
+        self.major = major_bodies(self.eph, self.minor)
+        self.table = None
+        if table_path:
+            # A tabela guarda só os corpos principais, na mesma ordem de self.major
+            self.table = EphemerisTable(table_path)
+            expected = [self.eph.names[i] for i in self.major]
+            if self.table.names != expected:
+                raise ValueError(f"A tabela '{table_path}' foi gerada para outros corpos "
+                                 f"({len(self.table)} na tabela, {len(expected)} principais na cena)")
+            print(f"✅ Tabela de efemérides: {table_path} (t = {self.table.t0:g} a {self.table.t_end:g} s)")
+        self.major_row = {body: row for row, body in enumerate(self.major)}
+        self._subsets = {}
+        self.minor_bodies = InstancedBodies(self.eph, self.minor, *random_appearance(len(self.minor)))
+        self.origin_rows = [self.major_row[int(body)] for body in self.minor_bodies.origins]
+
+        # Seleção com o mouse: todos os corpos das efemérides e o Sol (último índice)
+        self.pick_names = self.eph.names + ["sun"]
+        self.pick_radii = np.zeros(len(self.pick_names))
+        self.pick_radii[:len(planets)] = [radius for _, _, radius, _, _ in planets]
+        self.pick_radii[self.minor] = self.minor_bodies.scales
+        self.pick_radii[-1] = 2.0
+        self.bvh = SphereBVH(min_radius=pick_min_radius)
+        self.selected = None
+        self.focus = False
+        self.last_time = None
+        self._fitted_frame = -1
+
+        self.queue = RenderQueue()
+
+        # Grafo de cena: posição orbital -> giro do corpo -> (Saturno) inclinação -> esfera/anéis
+        self.graph = graph = SceneGraph()
+        graph.add("sun")
+        for name, _, radius, _, _ in planets:
+            graph.add(name)
+            if name == "saturn":
+                graph.add("saturn.spin", "saturn")
+                graph.add("saturn.tilt", "saturn.spin", rotation(26.7, (1, 0, 0))[0])
+                graph.add("saturn.body", "saturn.tilt", scaling(radius)[0])
+                graph.add("saturn.rings", "saturn.tilt")
+            else:
+                graph.add(f"{name}.body", name)
+        graph.add("moon", "earth")
+        self.planet_nodes = [name for name, _, _, _, _ in planets]
+        self.spin_nodes = [f"{name}.spin" if name == "saturn" else f"{name}.body" for name in self.planet_nodes]
+        self.spin_scale = np.array([1.0 if name == "saturn" else radius for name, _, radius, _, _ in planets])
+        self.draw_nodes = [graph.index[f"{name}.body"] for name in self.planet_nodes] + [graph.index["moon"]]
+        self.orbits = OrbitBatch([orbit_radius for _, orbit_radius, _, _, _ in planets], orbit_segments)
+
+    def positions_at(self, t, bodies=None):
+        """Posições no mundo em t de todos os corpos, ou só de `bodies`.
+
+        Corpos principais vêm da tabela quando ela cobre t; os menores (que só
+        estão nas efemérides) são sempre resolvidos pelo Ephemeris.
+        """
+        table = self.table if self.table and self.table.covers(t) else None
+        if bodies is None:
+            positions = self.eph.positions(t)
+            if table:
+                positions[list(self.major)] = table.positions(t)
+            return positions
+        if table and all(i in self.major_row for i in bodies):
+            return table.positions(t, [self.major_row[i] for i in bodies])
+        key = tuple(bodies)
+        if key not in self._subsets:
+            sub = self.eph.subset(key)
+            self._subsets[key] = (sub, [sub.index[self.eph.names[i]] for i in key])
+        sub, rows = self._subsets[key]
+        return sub.positions(t)[rows]
+
+    def pick(self, mouse):
+        """Seleciona o corpo sob o cursor no último frame desenhado; devolve o nome ou None."""
+        if self.last_time is None:
+            return None
+        if self._fitted_frame != self.frame:
+            # Só reajusta a BVH quando há clique, e no máximo uma vez por frame. Os corpos
+            # menores só existem no shader, então aqui se calcula a posição de todos
+            self.pick_radii[self.eph.index["moon"]] = 0.3 if self.textures.failed("moon") else 0.07
+            centers = np.vstack([self.positions_at(self.last_time), np.zeros((1, 3))])
+            self.bvh.refit(centers, self.pick_radii)
+            self._fitted_frame = self.frame
+        origin, direction = camera_ray(mouse, self.size, cam_view, self.projection)
+        self.selected, _ = self.bvh.intersect(origin, direction)
+        if self.selected is None:
+            self.focus = False
+            return None
+        return self.pick_names[self.selected]
+
+    def selected_position(self, positions):
+        """Posição do corpo selecionado; `positions` são as dos corpos principais no frame."""
+        if self.selected == len(self.pick_names) - 1:
+            return np.zeros(3)  # Sol
+        if self.selected in self.major_row:
+            return positions[self.major_row[self.selected]]
+        return self.positions_at(self.last_time, [self.selected])[0]
+
+    def release(self):
+        self.textures.shutdown()
+        self.skybox.delete()
+        self.minor_bodies.delete()
+        release_meshes()
+
+
+def render_frame(scene, profiler):
+    """Desenha um frame da cena no estado atual da simulação e da câmera."""
+    planets, textures, residency, lod = scene.planets, scene.textures, scene.residency, scene.lod
+    sim, program = scene.sim, scene.program
+
+    state.reset_counters()
+    angle_arr, spin_arr = sim.interpolated()
+    angles = dict(zip(scene.body_names, angle_arr))
+    self_rot = spin_arr[sim.index["earth"]]
+    sun_self = spin_arr[sim.index["sun"]]
+
+    # Texturas que terminaram de decodificar
+    with profiler.stage("texturas"):
+        textures.pump()
+        tex_sun = textures.get("sun")
+        tex_norm = textures.get("earth_normal")
+        tex_moon = textures.get("moon")
+        scene.skybox.pump()
+        tex_saturn_ring = textures.get("saturn_ring")
+
+    # Posições dos corpos principais (os menores saem do shader), frustum culling e LOD
+    with profiler.stage("efemerides"):
+        t = sim.interpolated_time()
+        positions = scene.positions_at(t, scene.major)
+    scene.last_time = t
+    if scene.focus and scene.selected is not None:
+        set_camera(scene.selected_position(positions))
+    else:
+        set_camera()
+
+    # Matrizes de mundo de todos os corpos em um passe vetorizado
+    with profiler.stage("transformacoes"):
+        graph = scene.graph
+        moon_radius = 0.3 if textures.failed("moon") else 0.07
+        earth = sim.index["earth"]
+        graph.set_local("sun", rotation(sun_self, (0, 1, 0)) @ scaling(2.0))
+        graph.set_local(scene.planet_nodes, translation(positions[:len(planets)]))
+        spins = rotation(angle_arr[:len(planets)], (0, 1, 0)) @ rotation(90, (1, 0, 0))  # corrige mapeamento
+        spins[earth] = spins[earth] @ rotation(self_rot, (0, 1, 0))[0]
+        graph.set_local(scene.spin_nodes, spins @ scaling(scene.spin_scale))
+        graph.set_local("moon", translation(positions[len(planets)] - positions[earth])
+                        @ rotation(angles["earth"] + angles["moon"], (0, 1, 0)) @ scaling(moon_radius))
+        graph.update()
+
+    with profiler.stage("culling_lod"):
+        models = graph.world[scene.draw_nodes]
+        centers = graph.world_positions(scene.draw_nodes)  # planetas e Lua
+        radii = np.array([radius * 2.5 if name == "saturn" else radius for name, _, radius, _, _ in planets]
+                         + [moon_radius])
+        visible = Frustum(scene.projection @ cam_view).spheres_visible(centers, radii)
+        distances = np.linalg.norm(centers - cam_eye, axis=1)
+        levels = lod.select(radii, distances)
+        scene.lod_stats.reset()
+        scene.lod_stats.record(visible, levels)
+
+        # Resolução de textura desejada pelo tamanho na tela
+        screen_px = lod.screen_diameter(radii, distances)
+        for i, (name, _, _, _, tex_key) in enumerate(planets):
+            if visible[i]:
+                residency.touch(tex_key, screen_px[i])
+                if name == "earth":
+                    residency.touch("earth_normal", screen_px[i])
+                elif name == "saturn":
+                    residency.touch("saturn_ring", screen_px[i])
+        if visible[-1]:
+            residency.touch("moon", screen_px[-1])
+        residency.touch("sun", lod.screen_diameter(2.0, np.linalg.norm(cam_eye)))
+
+    with profiler.stage("asteroides"):
+        scene.minor_bodies.update(t, positions[scene.origin_rows])
+
+    # Luz (Sol na origem) no espaço da câmera
+    light_view = (cam_view @ [0.0, 0.0, 0.0, 1.0])[:3]
+
+    # Monta a fila do frame; a ordem de desenho sai da ordenação, não daqui
+    with profiler.stage("fila"):
+        queue = scene.queue
+        plain = Material()
+        if scene.skybox.texture:
+            queue.add(PASS_SKY, Material(scene.skybox.program, cull=False, depth_test=False),
+                      partial(scene.skybox.draw, cam_view, scene.projection))
+
+        sun_model = graph.world_matrix("sun")
+        sun_depth = float(np.linalg.norm(cam_eye))
+        if tex_sun:
+            queue.add(PASS_OPAQUE, Material(textures=(tex_sun,)), partial(draw_body, sun_model, 64, 64), sun_depth)
+        else:
+            queue.add(PASS_OPAQUE, plain, partial(draw_body, sun_model, color=(1, 1, 0)), sun_depth)
+
+        queue.add(PASS_LINES, plain, partial(draw_orbits, scene.orbits, (0.6, 0.6, 0.6)))
 
-    glUseProgram(0)
-    if tex_enabled:
-        glDisable(GL_TEXTURE_2D)
+        for i, (name, orbit_radius, radius, orbit_speed, tex_key) in enumerate(planets):
+            if not visible[i]:
+                continue
+            tex = textures.get(tex_key)
+            slices, stacks = lod.resolution(levels[i])
 
-    glColor3fv(color)
-    glBegin(GL_LINE_LOOP)
-    for i in range(segments):
-        a = 2.0 * math.pi * i / segments
-        x = math.cos(a) * radius
-        z = math.sin(a) * radius
-        glVertex3f(x, 0.0, z)
-    glEnd()
+            # Terra com shader
+            if name == "earth" and tex and tex_norm:
+                material = Material(program, (tex, tex_norm), uniforms={"uLightPosV": light_view})
+                color = None
+            else:
+                material = Material(textures=(tex,)) if tex else plain
+                color = None if tex else PLACEHOLDER_COLORS[name]
+            queue.add(PASS_OPAQUE, material, partial(draw_body, models[i], slices, stacks, color), distances[i])
 
-    glColor3f(1.0, 1.0, 1.0)
+            if name == "saturn":
+                queue.add(PASS_TRANSPARENT, Material(textures=(tex_saturn_ring,), blend=True, cull=False),
+                          partial(draw_saturn_rings, graph.world_matrix("saturn.rings"), radius * 1.2,
+                                  radius * 2.5, bool(tex_saturn_ring), ring_segments), distances[i])
 
-    if tex_enabled:
-        glEnable(GL_TEXTURE_2D)
-    if was_program:
-        glUseProgram(was_program)
+        if scene.selected is not None:
+            radius = max(scene.pick_radii[scene.selected], pick_min_radius) * 1.3
+            queue.add(PASS_LINES, plain, partial(draw_highlight, scene.selected_position(positions), radius))
 
-def draw_saturn_rings(inner_radius, outer_radius, texture_id=None, segments=128):
-    """Desenha os anéis de Saturno com gradiente de transparência usando textura se fornecida."""
-    glPushMatrix()
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    glDisable(GL_CULL_FACE)  # permite ver de ambos os lados
+        # Asteroides e luas menores (um único draw instanciado)
+        queue.add(PASS_OPAQUE, Material(scene.minor_bodies.program),
+                  partial(scene.minor_bodies.draw, light_view))
 
-    if texture_id:
-        glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, texture_id)
-        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+        # Lua orbitando a Terra
+        if visible[-1]:
+            slices, stacks = lod.resolution(levels[-1])
+            color = None if tex_moon else PLACEHOLDER_COLORS["moon"]
+            queue.add(PASS_OPAQUE, Material(textures=(tex_moon,)) if tex_moon else plain,
+                      partial(draw_body, models[-1], slices, stacks, color), distances[-1])
+
+    # Limpa tela e desenha; o profiler mede cada pass da fila separadamente
+    with profiler.stage("limpar"):
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+    queue.flush(profiler)
+
+    residency.update()
+    scene.frame += 1
+
+
+def install_gl_counter(stub=False):
+    """Conta as chamadas GL de todos os módulos da cena (stub=True não usa a GPU)."""
+    import meshes, textures, shaders, asteroids, profiler, gl_state, cubemap, frame_export, render_queue
+    counter = GLCallCounter(stub=stub)
+    counter.install(sys.modules[__name__], meshes, textures, shaders, asteroids, profiler, gl_state, cubemap,
+                    frame_export, render_queue)
+    return counter
+
+
+def open_headless(size, stub=False):
+    """Janela oculta só para ter um contexto GL (stub=True: nem isso). Devolve o contador de chamadas."""
+    if stub:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    counter = install_gl_counter(stub)
+    if stub:
+        pygame.display.set_mode(size)
     else:
-        glDisable(GL_TEXTURE_2D)
+        pygame.display.set_mode(size, DOUBLEBUF | OPENGL | HIDDEN)
+    return counter
 
-    glBegin(GL_QUAD_STRIP)
-    for i in range(segments + 1):
-        theta = 2.0 * math.pi * i / segments
-        x_inner = math.cos(theta) * inner_radius
-        z_inner = math.sin(theta) * inner_radius
-        x_outer = math.cos(theta) * outer_radius
-        z_outer = math.sin(theta) * outer_radius
 
-        alpha_inner = 0.8
-        alpha_outer = 0.2
+def run_benchmark(frames, stub=False, out=None, table_path=None):
+    """Roda `frames` frames sem interação, com câmera roteirizada e simulação determinística."""
+    global cam_angle_x, cam_angle_y, cam_distance
 
-        if texture_id:
-            glColor4f(1.0, 1.0, 1.0, alpha_inner)
-        else:
-            glColor4f(0.8, 0.7, 0.5, alpha_inner)  # cor marrom-claro se sem textura
-        glTexCoord2f(0.0, 0.0)
-        glVertex3f(x_inner, 0.0, z_inner)
+    size = (900, 700)
+    counter = open_headless(size, stub)
+    scene = Scene(size, table_path)
+    profiler = FrameProfiler(capacity=frames, counter=counter)
+    for frame in range(frames):
+        profiler.begin_frame()
+        cam_angle_x, cam_angle_y, cam_distance = scripted_camera(frame, frames)
+        scene.sim.step(1)
+        render_frame(scene, profiler)
+        with profiler.stage("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+
+    summary = profiler.summary()
+    p = summary["frame_ms"]
+    print(f"✅ {frames} frames ({'GL falso' if stub else 'GPU'}): "
+          f"p50 {p[50]:.2f} ms  p90 {p[90]:.2f} ms  p99 {p[99]:.2f} ms  "
+          f"{summary['gl_calls_per_frame']:.0f} chamadas GL/frame | {state.summary()} | {scene.queue.summary()}")
+    for name, ms in summary["stages_ms"].items():
+        print(f"   {name:<14}{ms:8.3f} ms")
+    if out:
+        profiler.export(out)
+        print(f"✅ Perfil salvo em {out}")
+
+    scene.release()
+    pygame.quit()
 
-        if texture_id:
-            glColor4f(1.0, 1.0, 1.0, alpha_outer)
-        else:
-            glColor4f(0.8, 0.7, 0.5, alpha_outer)
-        glTexCoord2f(1.0, 1.0)
-        glVertex3f(x_outer, 0.0, z_outer)
-    glEnd()
 
-    if texture_id:
-        glBindTexture(GL_TEXTURE_2D, 0)
-        glDisable(GL_TEXTURE_2D)
+def run_export(frames, out, resolution=(1920, 1080), fps=60, stub=False, table_path=None):
+    """Renderiza `frames` frames num framebuffer fora da tela e grava em `out`.
+
+    `out` é uma pasta de PNGs ou um arquivo de vídeo (ffmpeg). O relógio da
+    simulação avança 1/fps por frame, a câmera segue scripted_camera e as
+    texturas são enviadas sem orçamento de tempo, então a mesma chamada gera
+    sempre o mesmo vídeo, tão rápido quanto a GPU deixar.
+    """
+    global cam_angle_x, cam_angle_y, cam_distance
+
+    counter = open_headless((320, 240), stub)
+    scene = Scene(resolution, table_path)
+
+    # Envios de textura síncronos: as trocas de mip da residência (que contam frames, não
+    # tempo) terminam sempre no mesmo frame, qualquer que seja a velocidade da máquina
+    scene.textures.budget = None
+
+    # O vídeo não deve mostrar placeholders: espera texturas e céu antes do primeiro frame
+    while scene.textures.pending() or not (scene.skybox.texture or scene.skybox.failed):
+        scene.textures.pump()
+        scene.skybox.pump()
+        time.sleep(0.005)
+
+    target = OffscreenTarget(*resolution)
+    reader = PixelReader(*resolution)
+    writer = FrameWriter(out, *resolution, fps=fps)
+    profiler = FrameProfiler(capacity=frames, counter=counter)
+
+    target.bind()
+    start = time.perf_counter()
+    for frame in range(frames):
+        profiler.begin_frame()
+        cam_angle_x, cam_angle_y, cam_distance = scripted_camera(frame, frames)
+        scene.sim.advance(1.0 / fps, clamp=False)
+        render_frame(scene, profiler)
+        with profiler.stage("leitura"):
+            ready = reader.read(frame)
+        if ready:
+            writer.put(*ready)
+        profiler.end_frame()
+    for ready in reader.finish():
+        writer.put(*ready)
+    render_time = time.perf_counter() - start
+    writer.close()
+    elapsed = time.perf_counter() - start
+    target.unbind()
+
+    p = profiler.percentiles()
+    print(f"✅ {writer.written} frames {resolution[0]}x{resolution[1]} em {elapsed:.1f} s "
+          f"({frames / elapsed:.1f} frames/s, {frames / fps / elapsed:.2f}x tempo real) -> {out}")
+    print(f"   render p50 {p[50]:.2f} ms  p90 {p[90]:.2f} ms; gravação esperou "
+          f"{elapsed - render_time:.1f} s depois do último frame")
+    for e in writer.errors[:5]:
+        print(f"❌ Erro ao gravar frame: {e}")
+
+    reader.delete()
+    target.delete()
+    scene.release()
+    pygame.quit()
 
-    glEnable(GL_CULL_FACE)
-    glDisable(GL_BLEND)
-    glPopMatrix()
+
+def run_build_table(path, t_start, t_end, step, max_gb=table_max_gb):
+    """Pré-calcula as efemérides dos corpos principais de t_start a t_end (segundos de simulação).
+
+    Os corpos menores ficam de fora: o shader os resolve a cada frame e a
+    seleção com o mouse usa o Ephemeris. Recusa (devolve False) se o arquivo
+    passaria de `max_gb` GB.
+    """
+    eph, minor = build_ephemeris()
+    eph = eph.subset(major_bodies(eph, minor))
+    size = table_size(len(eph), t_start, t_end, step)
+    if size > max_gb * 2**30:
+        print(f"❌ A tabela teria {size / 2**30:.2f} GB ({len(eph)} corpos, t = {t_start:g} a {t_end:g} s "
+              f"a cada {step:g} s), acima do limite de {max_gb:g} GB. Reduza --table-range, "
+              f"aumente --table-step ou suba o limite com --table-max-gb.")
+        return False
+    print(f"Gerando {path}: {len(eph)} corpos, t = {t_start:g} a {t_end:g} s a cada {step:g} s "
+          f"(~{size / 2**20:.0f} MB)")
+    count = build_table(eph, path, t_start, t_end, step)
+    print(f"✅ Tabela salva: {path} ({count} amostras)")
+    return True
+
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
 
 
 def main():
-    global angle_earth, angle_mars, angle_moon, earth_self, sun_self
-    global cam_angle_x, cam_angle_y, cam_distance
+    global cam_angle_x, cam_angle_y, cam_distance, asteroid_count
+
+    parser = argparse.ArgumentParser(description="Sistema Solar 3D")
+    parser.add_argument("--benchmark", type=int, metavar="FRAMES",
+                        help="roda FRAMES frames com câmera roteirizada, sem mouse, e sai")
+    parser.add_argument("--stub-gl", action="store_true",
+                        help="no benchmark/export, troca o OpenGL por um backend falso que só conta chamadas")
+    parser.add_argument("--profile-out", metavar="ARQUIVO",
+                        help="salva o perfil dos frames em CSV ou JSON (pela extensão)")
+    parser.add_argument("--count-gl", action="store_true", help="conta chamadas GL por frame (mais lento)")
+    parser.add_argument("--export", metavar="SAIDA",
+                        help="grava um sobrevoo fora da tela: pasta de PNGs ou vídeo .mp4/.mkv/.mov/.webm")
+    parser.add_argument("--frames", type=int, default=600, help="frames do --export")
+    parser.add_argument("--resolution", type=parse_resolution, default=(1920, 1080), metavar="LxA",
+                        help="resolução do --export (ex.: 3840x2160)")
+    parser.add_argument("--fps", type=int, default=60, help="quadros por segundo do --export")
+    parser.add_argument("--asteroids", type=int, default=asteroid_count, help="corpos no cinturão de asteroides")
+    parser.add_argument("--table", metavar="ARQUIVO", help="usa uma tabela de efemérides pré-calculada")
+    parser.add_argument("--build-table", metavar="ARQUIVO", help="gera a tabela de efemérides e sai")
+    parser.add_argument("--table-range", type=float, nargs=2, default=table_range, metavar=("INICIO", "FIM"),
+                        help="intervalo da tabela em segundos de simulação")
+    parser.add_argument("--table-step", type=float, default=table_step, help="intervalo entre amostras da tabela (s)")
+    parser.add_argument("--table-max-gb", type=float, default=table_max_gb,
+                        help="tamanho máximo do arquivo do --build-table em GB")
+    args = parser.parse_args()
+
+    asteroid_count = args.asteroids
+    if args.build_table:
+        if not run_build_table(args.build_table, *args.table_range, args.table_step, args.table_max_gb):
+            sys.exit(1)
+        return
+    if args.benchmark:
+        run_benchmark(args.benchmark, stub=args.stub_gl, out=args.profile_out, table_path=args.table)
+        return
+    if args.export:
+        run_export(args.frames, args.export, args.resolution, args.fps, stub=args.stub_gl, table_path=args.table)
+        return
 
     pygame.init()
+    counter = install_gl_counter() if args.count_gl else None
     size = (900, 700)
     pygame.display.set_mode(size, DOUBLEBUF | OPENGL)
     pygame.display.set_caption("Sistema Solar 3D - PyOpenGL + Shader + Transparência")
 
-    # OpenGL setup
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    gluPerspective(45.0, size[0] / float(size[1]), 0.1, 500.0)
-    glMatrixMode(GL_MODELVIEW)
-    glEnable(GL_DEPTH_TEST)
-    glEnable(GL_TEXTURE_2D)
-    glEnable(GL_BLEND)
-    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
-    glClearColor(0.0, 0.0, 0.0, 1.0)
-
-    # Texturas
-    tex_sun = load_texture("textures/sol.jpg")
-    tex_earth = load_texture("textures/earth.jpg")
-    tex_norm = load_texture("textures/normal_map_earth.tif")
-    tex_moon = load_texture("textures/8k_moon.jpg")
-    tex_mars = load_texture("textures/8k_mars.jpg")
-    tex_mercury = load_texture("textures/8k_mercury.jpg")
-    tex_venus = load_texture("textures/8k_venus_surface.jpg")
-    tex_jupiter = load_texture("textures/8k_jupiter.jpg")
-    tex_saturn = load_texture("textures/8k_saturn.jpg")
-    tex_uranus = load_texture("textures/2k_uranus.jpg")
-    tex_neptune = load_texture("textures/2k_neptune.jpg")
-    tex_stars = load_texture("textures/8k_stars_milky_way.jpg")
-    tex_saturn_ring = load_texture("textures/8k_saturn_ring.png")
-
-    # Shader da Terra
-    program = create_program(VERT_SRC, FRAG_SRC)
+    scene = Scene(size, args.table)
+    sim = scene.sim
+    table = scene.table
+    profiler = FrameProfiler(counter=counter)
+    show_overlay = False
 
+    # Tab alterna entre girar a câmera com o mouse e usar o cursor para selecionar corpos
+    cursor_mode = False
     pygame.event.set_grab(True)
     pygame.mouse.set_visible(False)
     last_mouse = pygame.mouse.get_pos()
     clock = pygame.time.Clock()
     running = True
 
-    angles = {p: 0.0 for p in ["mercury","venus","earth","mars","jupiter","saturn","uranus","neptune","moon"]}
-    self_rot = 0.0
-
-    planets = [
-        ("mercury", 3.5, 0.25, 1.6, tex_mercury),
-        ("venus", 5.5, 0.45, 1.2, tex_venus),
-        ("earth", 8.0, 0.8, 0.8, tex_earth),
-        ("mars", 13.0, 0.6, 0.5, tex_mars),
-        ("jupiter", 20.0, 1.5, 0.3, tex_jupiter),
-        ("saturn", 26.0, 1.2, 0.25, tex_saturn),
-        ("uranus", 31.0, 0.9, 0.2, tex_uranus),
-        ("neptune", 36.0, 0.85, 0.18, tex_neptune)
-    ]
-
     while running:
+        profiler.begin_frame()
+
         # Eventos
         for e in pygame.event.get():
             if e.type == QUIT:
                 running = False
             if e.type == MOUSEBUTTONDOWN:
+                if e.button == 1 and cursor_mode:
+                    name = scene.pick(e.pos)
+                    print(f"✅ Selecionado: {name}" if name else "Nenhum corpo sob o cursor")
                 if e.button == 4: cam_distance = max(5.0, cam_distance - zoom_speed)
                 if e.button == 5: cam_distance = min(100.0, cam_distance + zoom_speed)
+            if e.type == KEYDOWN:
+                if e.key == K_RIGHTBRACKET: sim.time_scale *= 2.0
+                if e.key == K_LEFTBRACKET: sim.time_scale /= 2.0
+                if e.key == K_F3: show_overlay = not show_overlay
+                if e.key == K_TAB:
+                    cursor_mode = not cursor_mode
+                    pygame.event.set_grab(not cursor_mode)
+                    pygame.mouse.set_visible(cursor_mode)
+                if e.key == K_f and scene.selected is not None: scene.focus = not scene.focus
+                if e.key == K_BACKSPACE: scene.selected, scene.focus = None, False
+                # Saltos no tempo: com tabela, 10% do intervalo dela; sem, seek_step
+                jump = (table.t_end - table.t0) / 10.0 if table else seek_step
+                if e.key == K_PAGEUP: sim.seek(sim.time + jump)
+                if e.key == K_PAGEDOWN: sim.seek(max(0.0, sim.time - jump))
+                if e.key == K_HOME: sim.seek(table.t0 if table else 0.0)
+                if e.key == K_END and table: sim.seek(table.t_end)
 
         # Movimento da câmera
         mx, my = pygame.mouse.get_pos()
         dx, dy = mx - last_mouse[0], my - last_mouse[1]
         last_mouse = (mx, my)
-        cam_angle_y += dx * mouse_sensitivity
-        cam_angle_x = max(-89.0, min(89.0, cam_angle_x - dy * mouse_sensitivity))
-
-        # Limpa tela
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        set_camera()
-
-        # Skybox
-        if tex_stars:
-            draw_skybox(tex_stars)
-
-        # Luz (Sol)
-        light_world = [0.0, 0.0, 0.0, 1.0]
-        mv_view = glGetDoublev(GL_MODELVIEW_MATRIX)
-        light_view = [
-            mv_view[0][0]*light_world[0] + mv_view[0][1]*light_world[1] + mv_view[0][2]*light_world[2] + mv_view[0][3],
-            mv_view[1][0]*light_world[0] + mv_view[1][1]*light_world[1] + mv_view[1][2]*light_world[2] + mv_view[1][3],
-            mv_view[2][0]*light_world[0] + mv_view[2][1]*light_world[1] + mv_view[2][2]*light_world[2] + mv_view[2][3]
-        ]
-
-        # Sol
-        glDisable(GL_LIGHTING)
-        glRotatef(sun_self, 0,1,0)
-        if tex_sun:
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, tex_sun)
-            q = gluNewQuadric()
-            gluQuadricTexture(q, GL_TRUE)
-            gluSphere(q, 2.0, 64, 64)
-            glBindTexture(GL_TEXTURE_2D, 0)
-        else:
-            draw_sphere_color(2.0, (1,1,0))
-
-        sun_self += 0.2
-
-        # Órbitas
-        for name, orbit_radius, _, _, _ in planets:
-            draw_orbit(orbit_radius, color=(0.6,0.6,0.6))
-
-        # Planetas
-        for name, orbit_radius, radius, orbit_speed, tex in planets:
-            angles[name] += orbit_speed
-            glPushMatrix()
-            glRotatef(angles[name], 0,1,0)
-            glTranslatef(orbit_radius, 0.0, 0.0)
-            glRotatef(90, 1,0,0)  # corrige mapeamento
-
-            # Terra com shader
-            if name == "earth":
-                glRotatef(self_rot,0,1,0)
-                glUseProgram(program)
-                glUniform1i(glGetUniformLocation(program,"uDiffuse"),0)
-                glUniform1i(glGetUniformLocation(program,"uNormalMap"),1)
-                glUniform3f(glGetUniformLocation(program,"uLightPosV"),*light_view)
-
-                glActiveTexture(GL_TEXTURE0)
-                glBindTexture(GL_TEXTURE_2D, tex)
-                glActiveTexture(GL_TEXTURE1)
-                glBindTexture(GL_TEXTURE_2D, tex_norm)
-
-                q = gluNewQuadric()
-                gluQuadricTexture(q, GL_TRUE)
-                gluSphere(q, radius, 64, 64)
-
-                glUseProgram(0)
-                glActiveTexture(GL_TEXTURE1)
-                glBindTexture(GL_TEXTURE_2D, 0)
-                glActiveTexture(GL_TEXTURE0)
-                glBindTexture(GL_TEXTURE_2D, 0)
-
-            # Saturno
-            elif name == "saturn":
-                glPushMatrix()
-                glRotatef(26.7,1,0,0)
-                if tex:
-                    glUseProgram(0)
-                    glEnable(GL_TEXTURE_2D)
-                    glBindTexture(GL_TEXTURE_2D, tex)
-                    q = gluNewQuadric()
-                    gluQuadricTexture(q, GL_TRUE)
-                    gluSphere(q, radius, 64,64)
-                    glBindTexture(GL_TEXTURE_2D,0)
-                draw_saturn_rings(radius*1.2,radius*2.5, tex_saturn_ring)
-                glPopMatrix()
-
-            # Outros planetas
-            else:
-                if tex:
-                    glUseProgram(0)
-                    glEnable(GL_TEXTURE_2D)
-                    glBindTexture(GL_TEXTURE_2D, tex)
-                    q = gluNewQuadric()
-                    gluQuadricTexture(q, GL_TRUE)
-                    gluSphere(q, radius,64,64)
-                    glBindTexture(GL_TEXTURE_2D,0)
-                else:
-                    draw_sphere_color(radius,(0.6,0.6,0.6))
-
-            glPopMatrix()
-
-        # Lua orbitando a Terra
-        glPushMatrix()
-        glRotatef(angles["earth"],0,1,0)
-        glTranslatef(8.0,0,0)
-        angles["moon"] += 2.0
-        glRotatef(angles["moon"],0,1,0)
-        glTranslatef(1.5,0,0)
-        if tex_moon:
-            glUseProgram(0)
-            glEnable(GL_TEXTURE_2D)
-            glBindTexture(GL_TEXTURE_2D, tex_moon)
-            q = gluNewQuadric()
-            gluQuadricTexture(q, GL_TRUE)
-            gluSphere(q,0.07,64,64)
-            glBindTexture(GL_TEXTURE_2D, 0)
-        else:
-            draw_sphere_color(0.3,(0.8,0.8,0.8))
-        glPopMatrix()
-
-        self_rot += 1.0
-        pygame.display.flip()
-        clock.tick(60)
-
+        if not cursor_mode:
+            cam_angle_y += dx * mouse_sensitivity
+            cam_angle_x = max(-89.0, min(89.0, cam_angle_x - dy * mouse_sensitivity))
+
+        # Simulação em passo fixo, desacoplada da taxa de quadros
+        sim.advance(clock.tick(max_fps) / 1000.0)
+
+        render_frame(scene, profiler)
+
+        if show_overlay:
+            draw_overlay(profiler.overlay_lines() + [state.summary(), scene.queue.summary()], size[1])
+        if scene.frame % 60 == 0:
+            selected = scene.pick_names[scene.selected] if scene.selected is not None else "nenhum"
+            pygame.display.set_caption(f"Sistema Solar 3D - {scene.lod_stats.summary()} | "
+                                       f"{scene.residency.summary()} | {state.summary()} | "
+                                       f"selecionado: {selected}{' (foco)' if scene.focus else ''}")
+        with profiler.stage("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+
+    if args.profile_out:
+        profiler.export(args.profile_out)
+    scene.release()
     pygame.quit()
 
 
@@ -0,0 +1,219 @@
+import ctypes
+
+import numpy as np
+from OpenGL.GL import *
+
+
+# ======================
+# Geração de malhas (CPU, uma única vez)
+# ======================
+def build_uv_sphere(slices, stacks):
+    """Gera posições, normais, UVs e índices de uma esfera unitária.
+
+    Segue a mesma convenção do gluSphere: polos no eixo Z, s variando com o
+    ângulo em torno do polo e t = 1 no polo +Z.
+    """
+    rho = np.linspace(0.0, np.pi, stacks + 1, dtype=np.float32)
+    theta = np.linspace(0.0, 2.0 * np.pi, slices + 1, dtype=np.float32)
+    rho, theta = np.meshgrid(rho, theta, indexing="ij")
+
+    x = -np.sin(theta) * np.sin(rho)
+    y = np.cos(theta) * np.sin(rho)
+    z = np.cos(rho)
+    positions = np.stack([x, y, z], axis=-1).reshape(-1, 3)
+    normals = positions.copy()
+
+    s = theta / (2.0 * np.pi)
+    t = 1.0 - rho / np.pi
+    texcoords = np.stack([s, t], axis=-1).reshape(-1, 2)
+
+    row = np.arange(stacks, dtype=np.uint32)[:, None] * (slices + 1)
+    col = np.arange(slices, dtype=np.uint32)[None, :]
+    a = (row + col).ravel()
+    b = a + slices + 1
+    indices = np.stack([a, b, a + 1, a + 1, b, b + 1], axis=-1).reshape(-1)
+
+    index_type = np.uint16 if len(positions) <= 0xFFFF else np.uint32
+    return (positions.astype(np.float32), normals.astype(np.float32),
+            texcoords.astype(np.float32), indices.astype(index_type))
+
+
+# ======================
+# Malhas na GPU (VBO + IBO)
+# ======================
+class Mesh:
+    """Malha indexada com atributos intercalados (posição, normal, UV) em VBO."""
+
+    STRIDE = 8 * 4  # 3 + 3 + 2 floats
+
+    def __init__(self, positions, normals, texcoords, indices, mode=GL_TRIANGLES):
+        vertices = np.hstack([positions, normals, texcoords]).astype(np.float32)
+        self.mode = mode
+        self.count = len(indices)
+        self.index_type = GL_UNSIGNED_SHORT if indices.dtype == np.uint16 else GL_UNSIGNED_INT
+        self.vertex_count = len(vertices)
+
+        self.vbo, self.ibo = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+        glTexCoordPointer(2, GL_FLOAT, self.STRIDE, ctypes.c_void_p(24))
+
+        glDrawElements(self.mode, self.count, self.index_type, ctypes.c_void_p(0))
+
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(2, [self.vbo, self.ibo])
+        self.vbo = self.ibo = 0
+
+
+_sphere_cache = {}
+
+
+def get_sphere(slices, stacks):
+    """Devolve a malha de esfera unitária para (slices, stacks), criando-a só na primeira vez."""
+    key = (slices, stacks)
+    mesh = _sphere_cache.get(key)
+    if mesh is None:
+        mesh = Mesh(*build_uv_sphere(slices, stacks))
+        _sphere_cache[key] = mesh
+    return mesh
+
+
+# ======================
+# Órbitas e anéis
+# ======================
+def build_circle(radius, segments):
+    """Vértices de um círculo no plano XZ (para GL_LINE_LOOP)."""
+    a = np.linspace(0.0, 2.0 * np.pi, segments, endpoint=False)
+    return np.stack([np.cos(a) * radius, np.zeros_like(a), np.sin(a) * radius], axis=-1).astype(np.float32)
+
+
+def build_annulus(inner_radius, outer_radius, segments, color=(1.0, 1.0, 1.0),
+                  alpha_inner=0.8, alpha_outer=0.2):
+    """Coroa circular no plano XZ como GL_TRIANGLE_STRIP com alfa e UV por vértice.
+
+    Devolve (posições, cores RGBA, UVs) alternando vértice interno e externo.
+    """
+    a = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    ring = np.stack([np.cos(a), np.zeros_like(a), np.sin(a)], axis=-1)
+    positions = np.empty((2 * (segments + 1), 3))
+    positions[0::2] = ring * inner_radius
+    positions[1::2] = ring * outer_radius
+
+    colors = np.empty((len(positions), 4))
+    colors[:, :3] = color
+    colors[0::2, 3] = alpha_inner
+    colors[1::2, 3] = alpha_outer
+
+    texcoords = np.zeros((len(positions), 2))
+    texcoords[1::2] = 1.0
+    return positions.astype(np.float32), colors.astype(np.float32), texcoords.astype(np.float32)
+
+
+_orbit_batches = []
+
+
+class OrbitBatch:
+    """Todas as órbitas em um único VBO, desenhadas com um glMultiDrawArrays."""
+
+    def __init__(self, radii, segments=256):
+        circles = [build_circle(r, segments) for r in radii]
+        vertices = np.concatenate(circles)
+        self.firsts = np.arange(len(circles), dtype=np.int32) * segments
+        self.counts = np.full(len(circles), segments, dtype=np.int32)
+
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        _orbit_batches.append(self)  # liberado por release_meshes()
+
+    def draw(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glMultiDrawArrays(GL_LINE_LOOP, self.firsts, self.counts, len(self.counts))
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.vbo])
+        self.vbo = 0
+
+
+class RingMesh:
+    """Coroa circular em VBO com posição, cor RGBA e UV intercalados."""
+
+    STRIDE = 9 * 4  # 3 + 4 + 2 floats
+
+    def __init__(self, positions, colors, texcoords):
+        vertices = np.hstack([positions, colors, texcoords]).astype(np.float32)
+        self.count = len(vertices)
+
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
+        glColorPointer(4, GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+        glTexCoordPointer(2, GL_FLOAT, self.STRIDE, ctypes.c_void_p(28))
+
+        glDrawArrays(GL_TRIANGLE_STRIP, 0, self.count)
+
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.vbo])
+        self.vbo = 0
+
+
+_ring_cache = {}
+
+
+def get_ring(inner_radius, outer_radius, segments=128, textured=True):
+    """Devolve a malha do anel, criando-a só na primeira vez para esses parâmetros."""
+    key = (inner_radius, outer_radius, segments, textured)
+    mesh = _ring_cache.get(key)
+    if mesh is None:
+        color = (1.0, 1.0, 1.0) if textured else (0.8, 0.7, 0.5)  # marrom-claro se sem textura
+        mesh = RingMesh(*build_annulus(inner_radius, outer_radius, segments, color))
+        _ring_cache[key] = mesh
+    return mesh
+
+
+def release_meshes():
+    """Libera todos os buffers de malhas criados."""
+    for cache in (_sphere_cache, _ring_cache):
+        for mesh in cache.values():
+            mesh.delete()
+        cache.clear()
+    for batch in _orbit_batches:
+        batch.delete()
+    _orbit_batches.clear()
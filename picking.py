@@ -0,0 +1,215 @@
+import argparse
+import time
+
+import numpy as np
+
+
+# ======================
+# Raio a partir do cursor
+# ======================
+def camera_ray(mouse, size, view, projection):
+    """Origem e direção (normalizada) no mundo do raio que passa pelo pixel `mouse`.
+
+    `view` e `projection` são as matrizes de camera.py (as mesmas do set_camera).
+    """
+    x = 2.0 * (mouse[0] + 0.5) / size[0] - 1.0
+    y = 1.0 - 2.0 * (mouse[1] + 0.5) / size[1]  # pygame conta linhas de cima para baixo
+    inv = np.linalg.inv(projection @ view)
+    near = inv @ [x, y, -1.0, 1.0]
+    far = inv @ [x, y, 1.0, 1.0]
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+
+def ray_spheres(origin, direction, centers, radii):
+    """Distância ao longo do raio até cada esfera (inf quando erra ou fica atrás)."""
+    oc = centers - origin
+    tca = oc @ direction
+    d2 = np.einsum("ij,ij->i", oc, oc) - tca * tca
+    r2 = radii * radii
+    half = np.sqrt(np.maximum(r2 - d2, 0.0))
+    t = np.where(tca - half > 0.0, tca - half, tca + half)  # câmera dentro da esfera: sai pela frente
+    return np.where((d2 <= r2) & (t > 0.0), t, np.inf)
+
+
+# ======================
+# BVH implícita sobre esferas
+# ======================
+def _spread_bits(v):
+    """Intercala 10 bits com dois zeros entre eles (código de Morton 3D)."""
+    v = v.astype(np.uint32) & 0x3FF
+    v = (v | (v << 16)) & 0x030000FF
+    v = (v | (v << 8)) & 0x0300F00F
+    v = (v | (v << 4)) & 0x030C30C3
+    v = (v | (v << 2)) & 0x09249249
+    return v
+
+
+def morton_codes(points):
+    """Códigos de Morton de 30 bits dos pontos, quantizados na caixa que os envolve."""
+    lo = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - lo, 1e-12)
+    q = np.clip((points - lo) / extent * 1023.0, 0, 1023)
+    return (_spread_bits(q[:, 0]) << 2) | (_spread_bits(q[:, 1]) << 1) | _spread_bits(q[:, 2])
+
+
+class SphereBVH:
+    """BVH de caixas alinhadas sobre esferas, em layout de heap e toda em NumPy.
+
+    build() ordena os corpos pela curva de Morton e agrupa `leaf_size`
+    vizinhos em cada folha; a árvore é binária completa (nó k tem filhos 2k e
+    2k+1, folhas a partir de `self.leaves`), então não há ponteiros. refit()
+    mantém a ordem e só recalcula as caixas, nível a nível, em O(n)
+    vetorizado; quando o movimento espalha tanto as folhas que a soma das
+    suas áreas passa de `rebuild_ratio` vezes a da construção, refaz a
+    ordenação. intersect() desce a árvore em largura, um nível por vez,
+    testando todos os nós da fronteira de uma só vez; começa já no nível com
+    `start_nodes` nós, porque testar 256 caixas custa o mesmo que testar uma.
+
+    `min_radius` é a tolerância de seleção: esferas menores que isso também
+    contam como atingidas quando o raio passa perto, mas um acerto exato (no
+    raio verdadeiro) sempre vence um acerto só por tolerância.
+    """
+
+    def __init__(self, leaf_size=16, rebuild_ratio=2.0, start_nodes=256, min_radius=0.0):
+        self.leaf_size = leaf_size
+        self.min_radius = min_radius
+        self.rebuild_ratio = rebuild_ratio
+        self.start_nodes = start_nodes
+        self.count = 0
+        self.builds = 0
+        self._built_area = None
+
+    def build(self, centers, radii):
+        centers = np.asarray(centers, dtype=np.float64)
+        self.count = n = len(centers)
+        self.order = np.argsort(morton_codes(centers), kind="stable")
+        used = -(-n // self.leaf_size)
+        self.leaves = 1 << max(int(np.ceil(np.log2(max(used, 1)))), 0)
+        self._starts = np.arange(0, n, self.leaf_size)
+
+        # Corpos de cada folha (-1 completa a última)
+        items = np.full(used * self.leaf_size, -1, dtype=np.int64)
+        items[:n] = self.order
+        self._items = items.reshape(used, self.leaf_size)
+
+        self._built_area = None
+        self.builds += 1
+        self.refit(centers, radii)
+
+    def refit(self, centers, radii):
+        """Atualiza as caixas para as novas posições (reconstrói se a árvore degradou)."""
+        centers = np.asarray(centers, dtype=np.float64)
+        radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), (len(centers),))
+        if len(centers) != self.count:
+            self.build(centers, radii)
+            return
+        self.centers, self.radii = centers, radii
+
+        c = centers[self.order]
+        r = np.maximum(radii[self.order], self.min_radius)[:, None]
+        self.lo = np.full((2 * self.leaves, 3), np.inf)
+        self.hi = np.full((2 * self.leaves, 3), -np.inf)
+        used = len(self._starts)
+        self.lo[self.leaves:self.leaves + used] = np.minimum.reduceat(c - r, self._starts)
+        self.hi[self.leaves:self.leaves + used] = np.maximum.reduceat(c + r, self._starts)
+
+        k = self.leaves // 2
+        while k >= 1:
+            nodes = np.arange(k, 2 * k)
+            self.lo[nodes] = np.minimum(self.lo[2 * nodes], self.lo[2 * nodes + 1])
+            self.hi[nodes] = np.maximum(self.hi[2 * nodes], self.hi[2 * nodes + 1])
+            k //= 2
+
+        area = self._leaf_area()
+        if self._built_area is None:
+            self._built_area = area
+        elif area > self.rebuild_ratio * self._built_area:
+            self.build(centers, radii)
+
+    def _leaf_area(self):
+        d = (self.hi - self.lo)[self.leaves:self.leaves + len(self._starts)]
+        return float(np.sum(d[:, 0] * d[:, 1] + d[:, 1] * d[:, 2] + d[:, 2] * d[:, 0]))
+
+    def intersect(self, origin, direction):
+        """(índice do corpo, distância) mais próximo atingido pelo raio, ou (None, inf)."""
+        if self.count == 0:
+            return None, np.inf
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        inv = 1.0 / np.where(direction == 0.0, 1e-30, direction)
+
+        first = min(self.start_nodes, self.leaves)
+        frontier = np.arange(first, 2 * first)
+        while True:
+            lo, hi = self.lo[frontier], self.hi[frontier]
+            t1 = (lo - origin) * inv
+            t2 = (hi - origin) * inv
+            tmin = np.minimum(t1, t2).max(axis=1)
+            tmax = np.maximum(t1, t2).min(axis=1)
+            frontier = frontier[(lo[:, 0] <= hi[:, 0]) & (tmax >= np.maximum(tmin, 0.0))]
+            if len(frontier) == 0:
+                return None, np.inf
+            if frontier[0] >= self.leaves:
+                break
+            frontier = np.concatenate([2 * frontier, 2 * frontier + 1])
+
+        bodies = self._items[frontier - self.leaves].ravel()
+        bodies = bodies[bodies >= 0]
+        centers, radii = self.centers[bodies], self.radii[bodies]
+        t = ray_spheres(origin, direction, centers, radii)
+        if not np.isfinite(t).any() and self.min_radius > 0.0:
+            t = ray_spheres(origin, direction, centers, np.maximum(radii, self.min_radius))
+        best = int(np.argmin(t))
+        if not np.isfinite(t[best]):
+            return None, np.inf
+        return int(bodies[best]), float(t[best])
+
+
+# ======================
+# Benchmark: consulta contra força bruta
+# ======================
+def benchmark(counts=(1_000, 10_000, 100_000, 1_000_000), rays=200):
+    from ephemeris import random_population
+    rng = np.random.default_rng(0)
+    for count in counts:
+        eph = random_population(count)
+        radii = rng.uniform(0.015, 0.06, count)
+        bvh = SphereBVH()
+        start = time.perf_counter()
+        bvh.build(eph.positions(0.0), radii)
+        build_ms = (time.perf_counter() - start) * 1000.0
+        centers = eph.positions(1.0 / 60.0)  # um frame depois
+        start = time.perf_counter()
+        bvh.refit(centers, radii)
+        refit_ms = (time.perf_counter() - start) * 1000.0
+
+        # Raios saindo de fora do cinturão em direção a corpos aleatórios
+        origins = rng.normal(0.0, 1.0, (rays, 3)) * 40.0
+        targets = centers[rng.integers(0, count, rays)]
+        directions = targets - origins
+        directions /= np.linalg.norm(directions, axis=1)[:, None]
+        start = time.perf_counter()
+        hits = [bvh.intersect(o, d) for o, d in zip(origins, directions)]
+        query_ms = (time.perf_counter() - start) * 1000.0 / rays
+        start = time.perf_counter()
+        brute = [ray_spheres(o, d, centers, radii) for o, d in zip(origins, directions)]
+        brute_ms = (time.perf_counter() - start) * 1000.0 / rays
+        agree = sum((h[0] is None and not np.isfinite(b.min())) or (h[0] is not None and np.isclose(h[1], b.min()))
+                    for h, b in zip(hits, brute))
+        print(f"{count:>9} corpos: construção {build_ms:7.2f} ms  refit {refit_ms:7.2f} ms  "
+              f"consulta {query_ms:6.3f} ms  (força bruta {brute_ms:7.3f} ms, {agree}/{rays} iguais)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark da BVH de picking.")
+    parser.add_argument("--counts", type=int, nargs="*", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--rays", type=int, default=200)
+    args = parser.parse_args(argv)
+    benchmark(args.counts, args.rays)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+from OpenGL.GL import *
+
+from gl_state import state
+
+
+# ======================
+# Profiler por etapa do frame
+# ======================
+class FrameProfiler:
+    """Guarda tempo de CPU por etapa, tempo total e chamadas GL dos últimos frames.
+
+    Os valores ficam em arrays NumPy usados como buffer circular de
+    `capacity` frames. Uso por frame:
+
+        profiler.begin_frame()
+        with profiler.stage("planetas"):
+            ...
+        profiler.end_frame()
+    """
+
+    def __init__(self, capacity=600, counter=None):
+        self.capacity = capacity
+        self.counter = counter
+        self.stages = []
+        self._stage_index = {}
+        self._stage_times = np.zeros((capacity, 0))
+        self._frame_times = np.zeros(capacity)
+        self._gl_calls = np.zeros(capacity, dtype=np.int64)
+        self._current = {}
+        self.frames = 0
+        self._frame_start = None
+
+    def _slot(self, name):
+        i = self._stage_index.get(name)
+        if i is None:
+            i = self._stage_index[name] = len(self.stages)
+            self.stages.append(name)
+            self._stage_times = np.hstack([self._stage_times, np.zeros((self.capacity, 1))])
+        return i
+
+    def begin_frame(self):
+        self._current = {}
+        if self.counter:
+            self.counter.reset()
+        self._frame_start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - start
+
+    def end_frame(self):
+        row = self.frames % self.capacity
+        self._frame_times[row] = time.perf_counter() - self._frame_start
+        self._stage_times[row] = 0.0
+        for name, elapsed in self._current.items():
+            col = self._slot(name)
+            self._stage_times[row, col] = elapsed
+        self._gl_calls[row] = self.counter.total if self.counter else 0
+        self.frames += 1
+
+    # -- consultas --
+    def _rows(self):
+        """Índices do buffer em ordem cronológica."""
+        n = min(self.frames, self.capacity)
+        start = self.frames - n
+        return np.arange(start, self.frames) % self.capacity
+
+    def frame_times(self):
+        return self._frame_times[self._rows()]
+
+    def percentiles(self, q=(50, 90, 99)):
+        """Percentis do tempo de frame em ms."""
+        times = self.frame_times()
+        if len(times) == 0:
+            return {p: 0.0 for p in q}
+        return {p: float(v) * 1000.0 for p, v in zip(q, np.percentile(times, q))}
+
+    def stage_means(self):
+        """Média de cada etapa em ms."""
+        rows = self._rows()
+        if len(rows) == 0:
+            return {}
+        means = self._stage_times[rows].mean(axis=0) * 1000.0
+        return dict(zip(self.stages, means.tolist()))
+
+    def summary(self):
+        rows = self._rows()
+        return {
+            "frames": int(len(rows)),
+            "frame_ms": self.percentiles(),
+            "stages_ms": self.stage_means(),
+            "gl_calls_per_frame": float(self._gl_calls[rows].mean()) if len(rows) else 0.0,
+            "gl_calls_by_function": self.counter.per_function() if self.counter else {},
+        }
+
+    def overlay_lines(self):
+        p = self.percentiles()
+        lines = [f"frame p50 {p[50]:.2f} ms  p90 {p[90]:.2f}  p99 {p[99]:.2f}"]
+        lines += [f"{name:<14}{ms:7.3f} ms" for name, ms in self.stage_means().items()]
+        if self.counter:
+            lines.append(f"chamadas GL/frame {self._gl_calls[self._rows()].mean():.0f}")
+        return lines
+
+    # -- exportação --
+    def export_csv(self, path):
+        rows = self._rows()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms", "gl_calls"] + [f"{s}_ms" for s in self.stages])
+            first = self.frames - len(rows)
+            for k, row in enumerate(rows):
+                writer.writerow([first + k, f"{self._frame_times[row] * 1000.0:.4f}", int(self._gl_calls[row])]
+                                + [f"{v * 1000.0:.4f}" for v in self._stage_times[row]])
+
+    def export_json(self, path):
+        data = self.summary()
+        data["frame_ms_series"] = (self.frame_times() * 1000.0).round(4).tolist()
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+    def export(self, path):
+        """CSV ou JSON conforme a extensão."""
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+
+# ======================
+# Contagem de chamadas GL (e backend falso sem GPU)
+# ======================
+def _stub_result(name, args):
+    if name in ("glGenBuffers", "glGenTextures", "glGenFramebuffers", "glGenRenderbuffers"):
+        n = args[0] if args else 1
+        _stub_result.next_id += n
+        ids = list(range(_stub_result.next_id - n + 1, _stub_result.next_id + 1))
+        return ids[0] if n == 1 else ids
+    if name in ("glCreateProgram", "glCreateShader"):
+        _stub_result.next_id += 1
+        return _stub_result.next_id
+    if name in ("glGetShaderiv", "glGetProgramiv"):
+        return 1
+    if name in ("glGetUniformLocation", "glGetAttribLocation"):
+        return 0
+    if name in ("glGetDoublev", "glGetFloatv"):
+        return np.identity(4)
+    if name in ("glGetIntegerv", "glIsEnabled"):
+        return 0
+    return None
+
+
+_stub_result.next_id = 0
+
+
+class GLCallCounter:
+    """Envolve as funções gl*/glu* importadas nos módulos da cena para contá-las.
+
+    Com stub=True as chamadas não chegam ao driver (devolvem valores falsos
+    plausíveis), o que permite medir o custo de CPU do loop sem GPU.
+    """
+
+    def __init__(self, stub=False):
+        self.stub = stub
+        self.total = 0
+        self._counts = {}
+        self._cumulative = {}
+
+    def reset(self):
+        for name, n in self._counts.items():
+            self._cumulative[name] = self._cumulative.get(name, 0) + n
+        self._counts = {}
+        self.total = 0
+
+    def per_function(self):
+        counts = dict(self._cumulative)
+        for name, n in self._counts.items():
+            counts[name] = counts.get(name, 0) + n
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+    def _wrap(self, name, fn):
+        def wrapper(*args, **kwargs):
+            self.total += 1
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if self.stub:
+                return _stub_result(name, args)
+            return fn(*args, **kwargs)
+
+        wrapper.gl_counted = True
+        return wrapper
+
+    def install(self, *modules):
+        """Substitui as funções GL nos globals de cada módulo pelas versões contadas."""
+        for module in modules:
+            ns = vars(module)
+            for name, fn in list(ns.items()):
+                if name.startswith("gl") and callable(fn) and not getattr(fn, "gl_counted", False):
+                    ns[name] = self._wrap(name, fn)
+
+
+# ======================
+# Overlay na tela
+# ======================
+_font = None
+
+
+def draw_overlay(lines, window_height, x=8, y=8):
+    """Escreve as linhas no canto superior esquerdo com pygame.font + glDrawPixels."""
+    global _font
+    if _font is None:
+        pygame.font.init()
+        _font = pygame.font.SysFont("monospace", 14)
+
+    state.use_program(0)
+    state.disable(GL_TEXTURE_2D)
+    state.disable(GL_DEPTH_TEST)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    line_h = _font.get_linesize()
+    for i, line in enumerate(lines):
+        surf = _font.render(line, True, (255, 255, 0), (0, 0, 0))
+        data = pygame.image.tostring(surf, "RGB", True)
+        glWindowPos2i(x, window_height - y - (i + 1) * line_h)
+        glDrawPixels(surf.get_width(), surf.get_height(), GL_RGB, GL_UNSIGNED_BYTE, data)
+    state.enable(GL_DEPTH_TEST)
+    state.enable(GL_TEXTURE_2D)
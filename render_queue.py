@@ -0,0 +1,121 @@
+from contextlib import nullcontext
+from itertools import groupby
+
+from OpenGL.GL import *
+
+from gl_state import state
+from shaders import uniform
+
+
+# ======================
+# Passes de desenho (ordem de submissão)
+# ======================
+PASS_SKY = 0          # fundo, sem profundidade
+PASS_OPAQUE = 1       # corpos sólidos, da frente para trás
+PASS_LINES = 2        # órbitas
+PASS_TRANSPARENT = 3  # anéis com blend, de trás para a frente
+
+# Estágio do profiler de cada pass
+PASS_NAMES = {PASS_SKY: "ceu", PASS_OPAQUE: "opacos", PASS_LINES: "linhas", PASS_TRANSPARENT: "transparentes"}
+
+def set_uniform(location, value):
+    """Envia um uniform float de 1 a 4 componentes."""
+    if len(value) == 1:
+        glUniform1f(location, *value)
+    elif len(value) == 2:
+        glUniform2f(location, *value)
+    elif len(value) == 3:
+        glUniform3f(location, *value)
+    else:
+        glUniform4f(location, *value)
+
+
+class Material:
+    """Estado GL de um item da fila: programa, texturas por unidade e flags.
+
+    `textures[i]` vai na unidade i; com `program` 0 vale o pipeline fixo e só
+    a unidade 0 é usada. `uniforms` são floats enviados quando o material é
+    aplicado; eles fazem parte da chave, então itens com valores diferentes
+    nunca compartilham o mesmo apply().
+    """
+
+    def __init__(self, program=0, textures=(), blend=False, cull=True, depth_test=True, uniforms=None):
+        self.program = program or 0
+        self.textures = tuple(t or 0 for t in textures)
+        self.blend = blend
+        self.cull = cull
+        self.depth_test = depth_test
+        self.uniforms = {name: tuple(float(v) for v in value) for name, value in (uniforms or {}).items()}
+        self.key = (self.program, self.textures, blend, cull, depth_test, tuple(sorted(self.uniforms.items())))
+
+    @property
+    def texture(self):
+        return self.textures[0] if self.textures else 0
+
+    def apply(self):
+        state.use_program(self.program)
+        for name, value in self.uniforms.items():
+            set_uniform(uniform(self.program, name), value)
+
+        # Unidades altas primeiro para a unidade 0 terminar ativa
+        for unit in range(len(self.textures) - 1, 0, -1):
+            state.bind_texture(self.textures[unit], unit)
+        state.active_texture(0)
+        if self.texture:
+            state.bind_texture(self.texture)
+            state.enable(GL_TEXTURE_2D)
+        else:
+            state.disable(GL_TEXTURE_2D)
+
+        if self.blend:
+            state.enable(GL_BLEND)
+            state.blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        else:
+            state.disable(GL_BLEND)
+        (state.enable if self.cull else state.disable)(GL_CULL_FACE)
+        (state.enable if self.depth_test else state.disable)(GL_DEPTH_TEST)
+
+
+# ======================
+# Fila ordenada
+# ======================
+class RenderQueue:
+    """Junta os itens do frame e os desenha em ordem que minimiza trocas de estado.
+
+    A chave de ordenação é (pass, programa, textura, profundidade). Itens
+    opacos com o mesmo material ficam juntos e, dentro do grupo, vão da
+    frente para trás; o pass transparente ignora o material e vai de trás
+    para a frente, depois de toda a geometria opaca.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.drawn = 0
+        self.material_changes = 0
+
+    def add(self, pass_, material, draw, depth=0.0):
+        """Enfileira `draw()` para ser chamado com `material` aplicado."""
+        if pass_ == PASS_TRANSPARENT:
+            key = (pass_, -depth, material.program, material.texture)
+        else:
+            key = (pass_, material.program, material.texture, depth)
+        self.items.append((key, len(self.items), material, draw))
+
+    def flush(self, profiler=None):
+        """Ordena, desenha e esvazia a fila. Com `profiler`, cada pass é medido como um estágio."""
+        self.items.sort(key=lambda item: item[:2])
+        current = None
+        self.material_changes = 0
+        for pass_, group in groupby(self.items, key=lambda item: item[0][0]):
+            with profiler.stage(PASS_NAMES[pass_]) if profiler else nullcontext():
+                for _, _, material, draw in group:
+                    if material.key != current:
+                        material.apply()
+                        current = material.key
+                        self.material_changes += 1
+                    draw()
+        self.drawn = len(self.items)
+        self.items = []
+
+    def summary(self):
+        return f"fila: {self.drawn} itens, {self.material_changes} trocas de material"
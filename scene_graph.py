@@ -0,0 +1,130 @@
+import numpy as np
+
+
+# ======================
+# Matrizes 4x4 em lote (convenção de vetor-coluna, como camera.py)
+# ======================
+def translation(offsets):
+    """(n, 3) -> (n, 4, 4), como glTranslatef."""
+    offsets = np.atleast_2d(offsets)
+    m = np.broadcast_to(np.identity(4), (len(offsets), 4, 4)).copy()
+    m[:, :3, 3] = offsets
+    return m
+
+
+def rotation(angles, axis):
+    """Rotações de `angles` graus em torno do eixo fixo `axis` -> (n, 4, 4), como glRotatef."""
+    a = np.radians(np.atleast_1d(np.asarray(angles, dtype=np.float64)))
+    x, y, z = np.asarray(axis, dtype=np.float64) / np.linalg.norm(axis)
+    c, s = np.cos(a), np.sin(a)
+    t = 1.0 - c
+    m = np.zeros((len(a), 4, 4))
+    m[:, 0, 0] = t * x * x + c
+    m[:, 0, 1] = t * x * y - s * z
+    m[:, 0, 2] = t * x * z + s * y
+    m[:, 1, 0] = t * x * y + s * z
+    m[:, 1, 1] = t * y * y + c
+    m[:, 1, 2] = t * y * z - s * x
+    m[:, 2, 0] = t * x * z - s * y
+    m[:, 2, 1] = t * y * z + s * x
+    m[:, 2, 2] = t * z * z + c
+    m[:, 3, 3] = 1.0
+    return m
+
+
+def scaling(factors):
+    """Escala uniforme por nó -> (n, 4, 4), como glScalef(f, f, f)."""
+    f = np.atleast_1d(np.asarray(factors, dtype=np.float64))
+    m = np.zeros((len(f), 4, 4))
+    m[:, 0, 0] = m[:, 1, 1] = m[:, 2, 2] = f
+    m[:, 3, 3] = 1.0
+    return m
+
+
+# ======================
+# Grafo de cena
+# ======================
+class SceneGraph:
+    """Nós com pai e transformação local; matrizes de mundo calculadas em lote.
+
+    Segue o mesmo layout do Ephemeris: arrays por nó e índices agrupados por
+    profundidade. update() multiplica world[pai] @ local nível a nível com
+    np.matmul, só para nós cuja local mudou ou cujo pai foi recalculado;
+    subárvores paradas (como a inclinação fixa de Saturno) não são refeitas.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.parent = np.zeros(0, dtype=np.int64)
+        self.local = np.zeros((0, 4, 4))
+        self.world = np.zeros((0, 4, 4))
+        self._dirty = np.zeros(0, dtype=bool)
+        self._levels = []
+        self.recomputed = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def _indices(self, nodes):
+        if isinstance(nodes, str):
+            return np.array([self.index[nodes]])
+        return np.array([self.index[n] if isinstance(n, str) else n for n in np.atleast_1d(nodes)],
+                        dtype=np.int64)
+
+    def add(self, name, parent=None, local=None):
+        """Acrescenta um nó (filho de `parent`, nome ou índice). Devolve o índice."""
+        i = len(self.names)
+        self.index[name] = i
+        self.names.append(name)
+        p = -1 if parent is None else int(self._indices(parent)[0])
+        self.parent = np.append(self.parent, p)
+        m = np.identity(4) if local is None else np.asarray(local, dtype=np.float64).reshape(4, 4)
+        self.local = np.concatenate([self.local, m[None]])
+        self.world = np.concatenate([self.world, np.identity(4)[None]])
+        self._dirty = np.append(self._dirty, True)
+        self._levels = self._hierarchy_levels()
+        return i
+
+    def _hierarchy_levels(self):
+        """Índices agrupados por profundidade (0 = raízes); pais sempre antes dos filhos."""
+        depth = np.zeros(len(self.parent), dtype=np.int64)
+        cur = self.parent.copy()
+        while np.any(cur >= 0):
+            up = cur >= 0
+            depth[up] += 1
+            cur[up] = self.parent[cur[up]]
+        return [np.flatnonzero(depth == d) for d in range(int(depth.max(initial=-1)) + 1)]
+
+    def set_local(self, nodes, matrices):
+        """Troca a transformação local de um ou vários nós (matrizes (4, 4) ou (n, 4, 4))."""
+        idx = self._indices(nodes)
+        self.local[idx] = matrices
+        self._dirty[idx] = True
+
+    def update(self):
+        """Recalcula as matrizes de mundo que mudaram. Devolve quantos nós foram refeitos."""
+        self.recomputed = 0
+        if not self._dirty.any():
+            return 0
+        for depth, idx in enumerate(self._levels):
+            if depth:
+                self._dirty[idx] |= self._dirty[self.parent[idx]]
+            sel = idx[self._dirty[idx]]
+            if len(sel) == 0:
+                continue
+            if depth:
+                self.world[sel] = np.matmul(self.world[self.parent[sel]], self.local[sel])
+            else:
+                self.world[sel] = self.local[sel]
+            self.recomputed += len(sel)
+        self._dirty[:] = False
+        return self.recomputed
+
+    def world_matrix(self, node):
+        return self.world[self._indices(node)[0]]
+
+    def world_positions(self, nodes=None):
+        """Origem de cada nó no mundo (n, 3)."""
+        w = self.world if nodes is None else self.world[self._indices(nodes)]
+        return w[:, :3, 3]
@@ -0,0 +1,45 @@
+import re
+
+from OpenGL.GL import *
+
+
+# ======================
+# Compilação de shaders
+# ======================
+_UNIFORM_RE = re.compile(r"^\s*uniform\s+\w+\s+(\w+)", re.MULTILINE)
+
+# Locations dos uniforms de cada programa, resolvidos uma vez no link
+uniform_locations = {}
+
+
+def compile_shader(src, stype):
+    sid = glCreateShader(stype)
+    glShaderSource(sid, src)
+    glCompileShader(sid)
+    if not glGetShaderiv(sid, GL_COMPILE_STATUS):
+        raise RuntimeError(glGetShaderInfoLog(sid).decode())
+    return sid
+
+
+def create_program(vsrc, fsrc, attributes=None):
+    """Compila e liga o programa; `attributes` fixa {nome: location} antes do link."""
+    vs = compile_shader(vsrc, GL_VERTEX_SHADER)
+    fs = compile_shader(fsrc, GL_FRAGMENT_SHADER)
+    pid = glCreateProgram()
+    glAttachShader(pid, vs)
+    glAttachShader(pid, fs)
+    for name, location in (attributes or {}).items():
+        glBindAttribLocation(pid, location, name)
+    glLinkProgram(pid)
+    if not glGetProgramiv(pid, GL_LINK_STATUS):
+        raise RuntimeError(glGetProgramInfoLog(pid).decode())
+    glDeleteShader(vs)
+    glDeleteShader(fs)
+    uniform_locations[pid] = {name: glGetUniformLocation(pid, name)
+                              for name in _UNIFORM_RE.findall(vsrc + fsrc)}
+    return pid
+
+
+def uniform(pid, name):
+    """Location do uniform `name` resolvida no link (-1 se não existir)."""
+    return uniform_locations[pid].get(name, -1)
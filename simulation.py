@@ -0,0 +1,91 @@
+import numpy as np
+
+
+# ======================
+# Simulação com passo fixo
+# ======================
+class Simulation:
+    """Estado dos corpos em arrays NumPy, avançado em passos fixos de tempo.
+
+    O renderizador chama advance() com o tempo real decorrido; a simulação
+    executa quantos passos de `dt` couberem (multiplicados por time_scale) e
+    guarda a fração restante em `alpha` para interpolar entre o estado anterior
+    e o atual. Como o movimento entre passos é linear, step(n) custa o mesmo
+    para qualquer n e dá para rodar sem janela muito mais rápido que o real.
+
+    Ângulos em graus; taxas em graus por segundo de simulação.
+    """
+
+    def __init__(self, names, orbit_rates, spin_rates=None, dt=1.0 / 60.0, time_scale=1.0,
+                 max_frame_time=0.25):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.orbit_rates = np.asarray(orbit_rates, dtype=np.float64)
+        self.spin_rates = (np.zeros_like(self.orbit_rates) if spin_rates is None
+                           else np.asarray(spin_rates, dtype=np.float64))
+        self.dt = dt
+        self.time_scale = time_scale
+        self.max_frame_time = max_frame_time
+
+        self.time = 0.0
+        self.steps = 0
+        self.angles = np.zeros(len(self.names))
+        self.spins = np.zeros(len(self.names))
+        self._prev_angles = self.angles.copy()
+        self._prev_spins = self.spins.copy()
+        self._accumulator = 0.0
+        self.alpha = 0.0
+
+    def step(self, n=1):
+        """Avança n passos fixos."""
+        if n <= 0:
+            return
+        span = n * self.dt
+        self.angles += self.orbit_rates * span
+        self.spins += self.spin_rates * span
+        # Mantém os ângulos em [0, 360) para não perder precisão com acelerações grandes
+        self.angles %= 360.0
+        self.spins %= 360.0
+        self._prev_angles = self.angles - self.orbit_rates * self.dt
+        self._prev_spins = self.spins - self.spin_rates * self.dt
+        self.time += span
+        self.steps += n
+
+    def advance(self, real_dt, clamp=True):
+        """Consome o tempo real decorrido (segundos) em passos fixos; devolve quantos passos rodou.
+
+        clamp=False não limita real_dt a max_frame_time (exportação offline,
+        onde cada frame vale exatamente 1/fps por maior que seja).
+        """
+        step_dt = min(real_dt, self.max_frame_time) if clamp else real_dt
+        self._accumulator += step_dt * self.time_scale
+        n = int(self._accumulator // self.dt)
+        self.step(n)
+        self._accumulator -= n * self.dt
+        self.alpha = self._accumulator / self.dt
+        return n
+
+    def interpolated(self):
+        """(ângulos, rotações) entre o passo anterior e o atual segundo alpha."""
+        a = self.alpha
+        return (self._prev_angles + (self.angles - self._prev_angles) * a,
+                self._prev_spins + (self.spins - self._prev_spins) * a)
+
+    def interpolated_time(self):
+        """Tempo de simulação correspondente ao estado interpolado."""
+        return self.time - (1.0 - self.alpha) * self.dt
+
+    def run_headless(self, seconds):
+        """Avança `seconds` de simulação sem renderizar (testes e lotes)."""
+        self.step(int(round(seconds / self.dt)))
+
+    def seek(self, t):
+        """Salta direto para o tempo t (segundos de simulação), sem passar pelos passos do meio."""
+        self.time = float(t)
+        self.steps = int(round(self.time / self.dt))
+        self.angles = np.mod(self.orbit_rates * self.time, 360.0)
+        self.spins = np.mod(self.spin_rates * self.time, 360.0)
+        self._prev_angles = self.angles - self.orbit_rates * self.dt
+        self._prev_spins = self.spins - self.spin_rates * self.dt
+        self._accumulator = 0.0
+        self.alpha = 1.0
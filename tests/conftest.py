@@ -0,0 +1,21 @@
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def restore_gl(monkeypatch):
+    """Devolve as funções gl* originais aos módulos da cena no fim do teste.
+
+    GLCallCounter.install troca essas funções nos globals dos módulos; sem
+    isso um teste deixaria o backend falso instalado para os seguintes.
+    """
+    import asteroids, cubemap, frame_export, gl_state, meshes, profiler, render_queue, shaders, textures
+    modules = [asteroids, cubemap, frame_export, gl_state, meshes, profiler, render_queue, shaders, textures]
+    if "main" in sys.modules:
+        modules.append(sys.modules["main"])
+    for module in modules:
+        for name, fn in list(vars(module).items()):
+            if name.startswith("gl") and callable(fn):
+                monkeypatch.setattr(module, name, fn)
+    return modules
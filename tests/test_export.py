@@ -0,0 +1,64 @@
+import itertools
+import os
+
+import pytest
+
+import main
+import textures
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SlowClock:
+    """perf_counter falso que anda `step` segundos a cada leitura (máquina lenta)."""
+
+    def __init__(self, step):
+        self._ticks = itertools.count()
+        self.step = step
+
+    def perf_counter(self):
+        return next(self._ticks) * self.step
+
+
+def export_signature(tmp_path, name, monkeypatch, frames=40, fps=30):
+    """Roda um export com GL falso e devolve, por frame, o que decide os pixels além da câmera:
+    nível de mip residente de cada textura, texturas disponíveis e matriz de câmera."""
+    recorded = []
+    render_frame = main.render_frame
+
+    def recording(scene, profiler):
+        render_frame(scene, profiler)
+        residency = tuple(sorted((key, level) for key, level, _, _ in scene.residency.report()["textures"]))
+        loaded = tuple(sorted(key for key in main.TEXTURE_FILES if scene.textures.get(key)))
+        recorded.append((scene.sim.interpolated_time(), residency, loaded, main.cam_view.tobytes()))
+
+    with monkeypatch.context() as m:
+        m.setattr(main, "render_frame", recording)
+        main.run_export(frames, str(tmp_path / name), resolution=(64, 48), fps=fps, stub=True)
+    return recorded
+
+
+@pytest.fixture
+def small_scene(monkeypatch, restore_gl):
+    monkeypatch.chdir(ROOT)  # caminhos das texturas e do cache são relativos à raiz
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    monkeypatch.setattr(main, "asteroid_count", 500)
+    monkeypatch.setattr(main, "sky_face_size", 64)
+
+
+def test_repeated_exports_render_the_same_frames(small_scene, tmp_path, monkeypatch):
+    first = export_signature(tmp_path, "a", monkeypatch)
+    # Segunda rodada numa "máquina lenta": cada leitura do relógio gasta 3 ms do orçamento de envio
+    monkeypatch.setattr(textures, "time", SlowClock(0.003))
+    second = export_signature(tmp_path, "b", monkeypatch)
+
+    assert len(first) == 40
+    assert first == second
+    assert len(os.listdir(tmp_path / "a")) == 40
+
+
+def test_low_fps_export_advances_a_full_frame_of_simulation(small_scene, tmp_path, monkeypatch):
+    # A 2 fps cada frame vale 0,5 s, acima do max_frame_time do modo interativo
+    times = [t for t, _, _, _ in export_signature(tmp_path, "lento", monkeypatch, frames=4, fps=2)]
+    steps = [b - a for a, b in zip(times, times[1:])]
+    assert steps == pytest.approx([0.5 * main.time_scale] * 3)
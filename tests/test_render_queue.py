@@ -0,0 +1,51 @@
+import pytest
+
+import gl_state
+import render_queue
+import shaders
+from gl_state import state
+from profiler import GLCallCounter
+from render_queue import PASS_OPAQUE, Material, RenderQueue
+
+
+@pytest.fixture
+def counter(monkeypatch, restore_gl):
+    """Contador com backend falso instalado nos módulos da fila (desfeito no fim do teste)."""
+    counter = GLCallCounter(stub=True)
+    counter.install(render_queue, gl_state)
+    monkeypatch.setitem(shaders.uniform_locations, 7, {"uLightPosV": 3, "uTint": 4})
+    state.invalidate()
+    yield counter
+    state.invalidate()
+
+
+def test_material_uniforms_go_through_the_counter(counter):
+    Material(7, uniforms={"uLightPosV": (1.0, 2.0, 3.0), "uTint": (0.5,)}).apply()
+    calls = counter.per_function()
+    assert calls.get("glUniform3f") == 1
+    assert calls.get("glUniform1f") == 1
+
+
+def test_queue_flush_counts_uniforms_once_per_material_change(counter):
+    queue = RenderQueue()
+    material = Material(7, uniforms={"uLightPosV": (0.0, 0.0, 0.0)})
+    for depth in (1.0, 2.0, 3.0):
+        queue.add(PASS_OPAQUE, material, lambda: None, depth)
+    queue.flush()
+    assert counter.per_function().get("glUniform3f") == 1
+    assert queue.material_changes == 1
+
+
+def test_queue_flush_resends_uniforms_when_values_differ(counter, monkeypatch):
+    sent = []
+    monkeypatch.setattr(render_queue, "glUniform3f", lambda loc, *value: sent.append((loc, value)))
+    queue = RenderQueue()
+    near = Material(7, uniforms={"uLightPosV": (1.0, 0.0, 0.0)})
+    far = Material(7, uniforms={"uLightPosV": (0.0, 2.0, 0.0)})
+    drawn = []
+    queue.add(PASS_OPAQUE, near, lambda: drawn.append(sent[-1][1]), 1.0)
+    queue.add(PASS_OPAQUE, far, lambda: drawn.append(sent[-1][1]), 2.0)
+    queue.flush()
+    assert sent == [(3, (1.0, 0.0, 0.0)), (3, (0.0, 2.0, 0.0))]
+    assert drawn == [(1.0, 0.0, 0.0), (0.0, 2.0, 0.0)]
+    assert queue.material_changes == 2
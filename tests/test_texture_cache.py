@@ -0,0 +1,34 @@
+import numpy as np
+
+from texture_cache import build_mip_chain
+
+
+def expected_shapes(h, w):
+    """Tamanhos que o GL exige em cada nível: max(1, n // 2) até 1x1."""
+    shapes = [(h, w)]
+    while h > 1 or w > 1:
+        h, w = max(1, h // 2), max(1, w // 2)
+        shapes.append((h, w))
+    return shapes
+
+
+def test_mip_levels_follow_floor_rule_for_npot_image():
+    # Mesmas dimensões do 8k_saturn_ring.png: 125 -> 62 -> 31 -> 15 ...
+    image = np.random.default_rng(0).integers(0, 256, (125, 2048, 3), dtype=np.uint8)
+    levels = build_mip_chain(image)
+    assert [lv.shape[:2] for lv in levels] == expected_shapes(125, 2048)
+    assert all(lv.shape[2] == 3 and lv.dtype == np.uint8 for lv in levels)
+
+
+def test_mip_levels_odd_in_both_dimensions():
+    levels = build_mip_chain(np.zeros((7, 5, 3), dtype=np.uint8))
+    assert [lv.shape[:2] for lv in levels] == [(7, 5), (3, 2), (1, 1)]
+
+
+def test_mip_average_drops_trailing_odd_row():
+    image = np.zeros((3, 2, 3), dtype=np.uint8)
+    image[:2] = 100
+    image[2] = 255  # linha ímpar descartada, não entra na média
+    levels = build_mip_chain(image)
+    assert levels[1].shape[:2] == (1, 1)
+    assert np.all(levels[1] == 100)
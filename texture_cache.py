@@ -0,0 +1,218 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pygame
+
+
+# ======================
+# Cache em disco de texturas pré-decodificadas
+# ======================
+# Cada entrada tem dois arquivos:
+#   <chave>.bin  — todos os níveis de mip RGB concatenados (já invertidos)
+#   <chave>.json — origem, dimensões e deslocamento de cada nível no .bin
+# A chave combina caminho, mtime e hash do conteúdo da imagem original.
+CACHE_DIR = ".texture_cache"
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 2  # 2: níveis de mip com floor(n/2)
+
+_index_lock = threading.Lock()  # o índice é atualizado pelas threads do carregador
+
+
+def decode_image(path):
+    """Decodifica a imagem e devolve (largura, altura, bytes RGB). Pode rodar fora da thread GL."""
+    surf = pygame.image.load(path)
+    surf = pygame.transform.flip(surf, False, True)
+    data = pygame.image.tostring(surf, "RGB", 1)
+    w, h = surf.get_rect().size
+    return w, h, data
+
+
+def build_mip_chain(image):
+    """Cadeia de mipmaps por média de blocos 2x2 (box filter) até 1x1.
+
+    Cada nível tem max(1, n // 2) em cada dimensão, como o GL exige para a
+    textura ficar completa; em dimensões ímpares a última linha/coluna é
+    descartada.
+    """
+    levels = [image]
+    level = image
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        h, w = level.shape[:2]
+        acc = level.astype(np.uint16)
+        if h > 1:
+            acc = acc[0:h - 1:2] + acc[1:h:2]
+        else:
+            acc = acc * 2
+        if w > 1:
+            acc = acc[:, 0:w - 1:2] + acc[:, 1:w:2]
+        else:
+            acc = acc * 2
+        level = ((acc + 2) // 4).astype(np.uint8)
+        levels.append(level)
+    return levels
+
+
+class CachedTexture:
+    """Níveis de mip de uma textura, normalmente vistas de um arquivo mapeado em memória."""
+
+    def __init__(self, path, levels):
+        self.path = path
+        self.levels = levels  # lista de arrays (h, w, 3) uint8, nível 0 primeiro
+
+    @property
+    def width(self):
+        return self.levels[0].shape[1]
+
+    @property
+    def height(self):
+        return self.levels[0].shape[0]
+
+    def variant(self, max_size):
+        """Versão reduzida cujo maior lado não passa de max_size (reaproveita a cadeia de mip)."""
+        for i, level in enumerate(self.levels):
+            if max(level.shape[:2]) <= max_size:
+                return CachedTexture(self.path, self.levels[i:])
+        return CachedTexture(self.path, self.levels[-1:])
+
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+
+def _file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(cache_dir, index):
+    tmp = os.path.join(cache_dir, INDEX_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp, os.path.join(cache_dir, INDEX_FILE))
+
+
+def cache_key(path, cache_dir=CACHE_DIR):
+    """Chave da entrada para `path` (caminho + mtime + hash do conteúdo).
+
+    O hash só é recalculado quando mtime ou tamanho mudam; caso contrário vem do índice.
+    """
+    src = os.path.abspath(path)
+    st = os.stat(src)
+    with _index_lock:
+        entry = _load_index(cache_dir).get(src)
+    if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        digest = entry["sha1"]
+    else:
+        digest = _file_hash(src)
+        if os.path.isdir(cache_dir):
+            with _index_lock:
+                index = _load_index(cache_dir)
+                index[src] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": digest}
+                _save_index(cache_dir, index)
+    return hashlib.sha1(f"{FORMAT_VERSION}|{src}|{st.st_mtime_ns}|{digest}".encode()).hexdigest()[:24]
+
+
+def _entry_paths(cache_dir, key):
+    base = os.path.join(cache_dir, key)
+    return base + ".bin", base + ".json"
+
+
+def open_entry(path, cache_dir=CACHE_DIR):
+    """Abre a entrada existente com np.memmap (sem copiar); None se não houver."""
+    bin_path, meta_path = _entry_paths(cache_dir, cache_key(path, cache_dir))
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        raw = np.memmap(bin_path, dtype=np.uint8, mode="r")
+    except (OSError, ValueError):
+        return None
+    levels = [raw[lv["offset"]:lv["offset"] + lv["nbytes"]].reshape(lv["height"], lv["width"], 3)
+              for lv in meta["levels"]]
+    return CachedTexture(path, levels)
+
+
+def build_entry(path, cache_dir=CACHE_DIR):
+    """Decodifica a imagem, gera os mipmaps e grava a entrada no cache."""
+    w, h, data = decode_image(path)
+    image = np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)
+    levels = build_mip_chain(image)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    bin_path, meta_path = _entry_paths(cache_dir, cache_key(path, cache_dir))
+    meta = {"source": os.path.abspath(path), "levels": []}
+    offset = 0
+    with open(bin_path + ".tmp", "wb") as f:
+        for level in levels:
+            f.write(level.tobytes())
+            meta["levels"].append({"width": level.shape[1], "height": level.shape[0],
+                                   "offset": offset, "nbytes": level.nbytes})
+            offset += level.nbytes
+    os.replace(bin_path + ".tmp", bin_path)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=1)
+    return CachedTexture(path, levels)
+
+
+def load(path, cache_dir=CACHE_DIR, max_size=None):
+    """Textura de `path` com mipmaps: do cache se válido, senão decodifica e grava."""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        pass
+    tex = open_entry(path, cache_dir)
+    if tex is None:
+        try:
+            tex = build_entry(path, cache_dir)
+        except OSError as e:
+            if not os.path.exists(path):
+                raise
+            print(f"⚠️ Cache de texturas indisponível ({e}); usando a imagem decodificada")
+            w, h, data = decode_image(path)
+            tex = CachedTexture(path, build_mip_chain(np.frombuffer(data, dtype=np.uint8).reshape(h, w, 3)))
+    if max_size:
+        tex = tex.variant(max_size)
+    return tex
+
+
+# ======================
+# Linha de comando: aquece ou reconstrói o cache
+# ======================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-decodifica as texturas e gera os mipmaps em cache.")
+    parser.add_argument("paths", nargs="*", help="imagens a processar (padrão: textures/*)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--rebuild", action="store_true", help="regera mesmo as entradas válidas")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob("textures/*"))
+    os.makedirs(args.cache_dir, exist_ok=True)
+    for path in paths:
+        try:
+            if not args.rebuild and open_entry(path, args.cache_dir) is not None:
+                print(f"✅ Em cache: {path}")
+                continue
+            tex = build_entry(path, args.cache_dir)
+        except Exception as e:
+            print(f"❌ Erro ao processar textura '{path}': {e}")
+            continue
+        print(f"✅ Gerada: {path} ({tex.width}x{tex.height}, {len(tex.levels)} níveis, "
+              f"{tex.nbytes() / 2**20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
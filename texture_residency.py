@@ -0,0 +1,151 @@
+import math
+
+
+# ======================
+# Residência de texturas na VRAM
+# ======================
+BYTES_PER_TEXEL = 4  # drivers costumam guardar RGB como RGBA
+
+
+def level_bytes(cached, base_level):
+    """Memória estimada da textura residente a partir de base_level (com os mips menores)."""
+    return sum(lv.shape[0] * lv.shape[1] * BYTES_PER_TEXEL for lv in cached.levels[base_level:])
+
+
+class _Entry:
+    def __init__(self, key, cached):
+        self.key = key
+        self.cached = cached
+        self.base = None        # nível residente (None = fora da GPU)
+        self.target = None      # nível pedido ao carregador
+        self.wanted = None      # nível desejado neste frame (menor = mais detalhe)
+        self.last_seen = -1
+
+    @property
+    def bytes(self):
+        return 0 if self.base is None else level_bytes(self.cached, self.base)
+
+    @property
+    def busy(self):
+        return self.target != self.base
+
+
+class TextureResidency:
+    """Mantém as texturas dentro de um orçamento de VRAM.
+
+    A cada frame o renderizador chama touch() para cada textura visível com o
+    tamanho do corpo na tela; o nível de mip residente é escolhido a partir
+    disso. Em update(), se o total passar do orçamento, as texturas vistas há
+    mais tempo são rebaixadas para mips menores e, no limite, liberadas. Quando
+    a câmera se aproxima de novo, elas são promovidas outra vez. As trocas usam
+    o envio progressivo do TextureLoader, então não travam o frame.
+    """
+
+    def __init__(self, loader, budget_mb=512.0, initial_max_size=2048, floor_size=64,
+                 evict_after=600):
+        self.loader = loader
+        self.budget = int(budget_mb * 2**20)
+        self.initial_max_size = initial_max_size
+        self.floor_size = floor_size
+        self.evict_after = evict_after  # frames sem ser vista antes de poder sair da GPU
+        self.frame = 0
+        self._entries = {}
+        loader.choose_level = self.choose_level
+        loader.on_uploaded = self.uploaded
+
+    # -- ganchos do TextureLoader --
+    def choose_level(self, key, cached):
+        entry = self._entries.setdefault(key, _Entry(key, cached))
+        entry.target = self._level_for_size(cached, self.initial_max_size)
+        return entry.target
+
+    def uploaded(self, key, tex, cached, base_level):
+        entry = self._entries.setdefault(key, _Entry(key, cached))
+        entry.base = base_level
+        if entry.target is None:
+            entry.target = base_level
+
+    # -- chamadas do renderizador --
+    def touch(self, key, screen_px):
+        """Marca a textura como visível neste frame ocupando ~screen_px pixels na tela."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.last_seen = self.frame
+        # metade da textura equirretangular cobre o diâmetro visível do corpo
+        level = self._level_for_size(entry.cached, 2.0 * screen_px)
+        entry.wanted = level if entry.wanted is None else min(entry.wanted, level)
+
+    def update(self):
+        """Decide promoções, rebaixamentos e liberações do frame e avisa o carregador."""
+        targets = {}
+        for entry in self._entries.values():
+            if entry.busy:
+                continue
+            target = entry.base
+            if entry.wanted is not None:
+                target = entry.wanted
+            targets[entry.key] = target
+            entry.wanted = None
+
+        # Envios em andamento já contam com o tamanho do nível pedido
+        used = sum(level_bytes(e.cached, e.target) for e in self._entries.values()
+                   if e.key not in targets and e.target is not None)
+        used += sum(level_bytes(self._entries[k].cached, t) for k, t in targets.items() if t is not None)
+
+        # Rebaixa (e depois libera) começando pelas vistas há mais tempo
+        lru = sorted(targets, key=lambda k: self._entries[k].last_seen)
+        for key in lru:
+            if used <= self.budget:
+                break
+            entry = self._entries[key]
+            floor = self._level_for_size(entry.cached, self.floor_size)
+            while used > self.budget and targets[key] is not None:
+                before = level_bytes(entry.cached, targets[key])
+                if targets[key] < floor:
+                    targets[key] += 1
+                elif self.frame - entry.last_seen >= self.evict_after:
+                    targets[key] = None
+                else:
+                    break
+                after = 0 if targets[key] is None else level_bytes(entry.cached, targets[key])
+                used -= before - after
+
+        for key, target in targets.items():
+            entry = self._entries[key]
+            if target == entry.base:
+                continue
+            entry.target = target
+            if target is None:
+                self.loader.evict(key)
+                entry.base = None
+            else:
+                self.loader.reupload(key, target)
+        self.frame += 1
+
+    # -- relatórios --
+    def used_bytes(self):
+        return sum(e.bytes for e in self._entries.values())
+
+    def report(self):
+        """Lista (chave, nível residente, resolução, bytes) e o uso total do orçamento."""
+        rows = []
+        for e in sorted(self._entries.values(), key=lambda e: -e.bytes):
+            if e.base is None:
+                rows.append((e.key, None, None, 0))
+            else:
+                lv = e.cached.levels[e.base]
+                rows.append((e.key, e.base, (lv.shape[1], lv.shape[0]), e.bytes))
+        return {"used": self.used_bytes(), "budget": self.budget, "textures": rows}
+
+    def summary(self):
+        resident = sum(1 for e in self._entries.values() if e.base is not None)
+        return (f"VRAM {self.used_bytes() / 2**20:.0f}/{self.budget / 2**20:.0f} MB "
+                f"({resident} texturas)")
+
+    @staticmethod
+    def _level_for_size(cached, size):
+        """Menor nível de mip (mais detalhado) cujo maior lado não passa muito de `size`."""
+        top = max(cached.levels[0].shape[:2])
+        level = int(math.floor(math.log2(top / max(size, 1.0)))) if size < top else 0
+        return max(0, min(level, len(cached.levels) - 1))
@@ -0,0 +1,188 @@
+import collections
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from OpenGL.GL import *
+
+import texture_cache
+from gl_state import state
+
+
+# ======================
+# Upload
+# ======================
+def create_texture(levels):
+    """Cria a textura 2D com mipmaps e aloca todos os níveis (sem enviar pixels).
+
+    `levels` é a lista de arrays (h, w, 3) do texture_cache, nível 0 primeiro.
+    """
+    tex = glGenTextures(1)
+    state.bind_texture(tex)
+    min_filter = GL_LINEAR_MIPMAP_LINEAR if len(levels) > 1 else GL_LINEAR
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, min_filter)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
+    for i, level in enumerate(levels):
+        h, w = level.shape[:2]
+        glTexImage2D(GL_TEXTURE_2D, i, GL_RGB, w, h, 0, GL_RGB, GL_UNSIGNED_BYTE, None)
+    return tex
+
+
+def upload_rows(tex, level_index, level, y0, y1):
+    """Envia as linhas [y0, y1) de um nível direto do array (memmap, sem cópia)."""
+    state.bind_texture(tex)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    glTexSubImage2D(GL_TEXTURE_2D, level_index, 0, y0, level.shape[1], y1 - y0,
+                    GL_RGB, GL_UNSIGNED_BYTE, level[y0:y1])
+
+
+def load_texture(path):
+    """Carrega a textura de forma síncrona (do cache em disco, todos os níveis de uma vez)."""
+    try:
+        cached = texture_cache.load(path)
+    except Exception as e:
+        print(f"❌ Erro ao carregar textura '{path}': {e}")
+        return None
+    tex = create_texture(cached.levels)
+    for i, level in enumerate(cached.levels):
+        upload_rows(tex, i, level, 0, level.shape[0])
+    print(f"✅ Textura carregada: {path} ({cached.width}x{cached.height})")
+    return tex
+
+
+# ======================
+# Carregamento assíncrono
+# ======================
+class _PendingUpload:
+    def __init__(self, key, cached, base_level=0):
+        self.key = key
+        self.cached = cached
+        self.base_level = min(base_level, len(cached.levels) - 1)
+        self.levels = cached.levels[self.base_level:]
+        self.tex = None
+        self.level = 0
+        self.next_row = 0
+
+    @property
+    def done(self):
+        return self.level >= len(self.levels)
+
+
+class TextureLoader:
+    """Decodifica imagens em um pool de threads e envia à GPU aos poucos.
+
+    As threads só abrem o cache em disco (ou decodificam e o preenchem); tudo
+    que toca o OpenGL acontece em pump(), chamado pela thread principal uma vez
+    por frame. Cada textura é alocada vazia e preenchida em faixas de linhas
+    com glTexSubImage2D até esgotar o orçamento de tempo do frame, então uma
+    imagem 8k nunca congela a janela. Com `budget_ms=None` pump() envia tudo o
+    que estiver pronto de uma vez, então o frame em que cada envio termina
+    não depende do relógio (usado na exportação de vídeo).
+
+    `choose_level(key, cached)` decide o nível de mip inicial de cada textura e
+    `on_uploaded(key, tex, cached, base_level)` é avisado ao fim de cada envio
+    (usados pelo gerenciador de residência em texture_residency.py).
+    """
+
+    def __init__(self, max_workers=4, budget_ms=4.0, rows_per_chunk=128,
+                 choose_level=None, on_uploaded=None):
+        self.budget = None if budget_ms is None else budget_ms / 1000.0
+        self.rows_per_chunk = rows_per_chunk
+        self.choose_level = choose_level
+        self.on_uploaded = on_uploaded
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="texture")
+        self._ready = queue.Queue()
+        self._reuploads = collections.deque()
+        self._current = None
+        self._handles = {}
+        self._sources = {}
+        self._failed = set()
+        self._requested = 0
+
+    def request(self, key, path):
+        """Agenda a decodificação de `path`; a textura fica disponível em get(key)."""
+        self._requested += 1
+        future = self._pool.submit(texture_cache.load, path)
+        future.add_done_callback(lambda f: self._ready.put((key, path, f)))
+
+    def get(self, key):
+        """Handle da textura ou None enquanto ainda não foi carregada (ou falhou)."""
+        return self._handles.get(key)
+
+    def failed(self, key):
+        return key in self._failed
+
+    def reupload(self, key, base_level):
+        """Reenvia a textura a partir de outro nível de mip (a antiga segue em uso até terminar)."""
+        self._reuploads.append(_PendingUpload(key, self._sources[key], base_level))
+
+    def evict(self, key):
+        """Libera a textura da GPU; get(key) volta a devolver None."""
+        tex = self._handles.pop(key, None)
+        if tex:
+            glDeleteTextures(1, [tex])
+            state.forget_texture(tex)
+
+    def pending(self):
+        return self._requested - len(self._sources) - len(self._failed)
+
+    def pump(self):
+        """Envia texturas decodificadas à GPU dentro do orçamento de tempo do frame (ou todas, sem orçamento)."""
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        while deadline is None or time.perf_counter() < deadline:
+            if self._current is None:
+                self._current = self._next_upload()
+                if self._current is None:
+                    return
+            self._upload_chunk(self._current)
+            if self._current.done:
+                self._finish(self._current)
+                self._current = None
+
+    def _finish(self, up):
+        old = self._handles.get(up.key)
+        if old:
+            glDeleteTextures(1, [old])
+            state.forget_texture(old)
+        self._handles[up.key] = up.tex
+        if up.key not in self._sources:
+            self._sources[up.key] = up.cached
+            w, h = up.levels[0].shape[1], up.levels[0].shape[0]
+            print(f"✅ Textura carregada: {up.cached.path} ({w}x{h})")
+        if self.on_uploaded:
+            self.on_uploaded(up.key, up.tex, up.cached, up.base_level)
+
+    def _next_upload(self):
+        if self._reuploads:
+            return self._reuploads.popleft()
+        while True:
+            try:
+                key, path, future = self._ready.get_nowait()
+            except queue.Empty:
+                return None
+            try:
+                cached = future.result()
+            except Exception as e:
+                print(f"❌ Erro ao carregar textura '{path}': {e}")
+                self._failed.add(key)
+                continue
+            base_level = self.choose_level(key, cached) if self.choose_level else 0
+            return _PendingUpload(key, cached, base_level)
+
+    def _upload_chunk(self, up):
+        if up.tex is None:
+            up.tex = create_texture(up.levels)
+        level = up.levels[up.level]
+        y0 = up.next_row
+        y1 = min(level.shape[0], y0 + self.rows_per_chunk)
+        upload_rows(up.tex, up.level, level, y0, y1)
+        up.next_row = y1
+        if y1 >= level.shape[0]:
+            up.level += 1
+            up.next_row = 0
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)